@@ -1,12 +1,19 @@
 import os
+import re
+import heapq
 import backoff
 import logging
 import time
-import requests as req  # Add this import
 from typing import Dict, List, Any, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Words marking paragraphs with important insights, used to pick context. The
+# lookahead finds every occurrence (even overlapping ones) in a single pass.
+_KEY_INDICATORS = ['purpose', 'main', 'functionality', 'core', 'responsible', 
+                   'primary', 'key', 'important', 'essential', 'relates to']
+_KEY_INDICATOR_REGEX = re.compile("(?=(" + "|".join(map(re.escape, _KEY_INDICATORS)) + "))")
+
 class BaseClaudeService:
     """
     Base service for Claude API interactions, providing common functionality for 
@@ -52,8 +59,8 @@ class BaseClaudeService:
                 e.response.status_code == 429
             ),
             on_backoff=lambda details: logger.warning(
-                f"Rate limit hit. Retrying in {details['wait']:.1f} seconds... "
-                f"(Attempt {details['tries']})"
+                "Rate limit hit. Retrying in %.1f seconds... (Attempt %s)",
+                details['wait'], details['tries']
             )
         )
         def _call_with_backoff():
@@ -87,18 +94,18 @@ class BaseClaudeService:
             except Exception as e:
                 # Log the exception
                 if hasattr(e, 'response') and hasattr(e.response, 'status_code') and e.response.status_code == 429:
-                    logger.error(f"Rate limit exceeded: {str(e)}")
+                    logger.error("Rate limit exceeded: %s", e)
                     # Re-raise for backoff to catch
                     raise e
                 # For other errors, just return an error message
-                logger.error(f"Error in _call_with_backoff: {str(e)}")
+                logger.error("Error in _call_with_backoff: %s", e)
                 return f"Analysis failed: {str(e)}"
         
         try:
             # Call with backoff
             return _call_with_backoff()
         except Exception as e:
-            logger.error(f"Final error after retries: {str(e)}")
+            logger.error("Final error after retries: %s", e)
             return f"Analysis failed after multiple retries: {str(e)}"
 
     # Update analyze_with_claude to use the retry mechanism
@@ -130,19 +137,19 @@ class BaseClaudeService:
             estimated_tokens = sum(len(content) for content in content.values()) // 4
             
             if estimated_tokens > 150000:  # Set a threshold below Claude's limit
-                logger.info(f"Section {section_name} is large (est. {estimated_tokens} tokens), splitting into batches")
+                logger.info("Section %s is large (est. %s tokens), splitting into batches", section_name, estimated_tokens)
                 
                 # Split content into smaller batches
                 content_batches = self._split_large_section(content)
                 
                 if len(content_batches) > 1:
-                    logger.info(f"Split {section_name} into {len(content_batches)} batches")
+                    logger.info("Split %s into %s batches", section_name, len(content_batches))
                     
                     # Process each batch
                     all_results = []
                     for i, batch_content in enumerate(content_batches):
                         batch_name = f"{section_name}_batch_{i+1}"
-                        logger.info(f"Processing {batch_name} with {len(batch_content)} files")
+                        logger.info("Processing %s with %s files", batch_name, len(batch_content))
                         
                         # Add batch info to query
                         batch_query = f"{query}\n\nNote: This is batch {i+1} of {len(content_batches)} for section '{section_name}'."
@@ -192,7 +199,7 @@ class BaseClaudeService:
             return self._analyze_with_retry(content, query, section_name, context, model, use_batch)
                 
         except Exception as e:
-            logger.error(f"Exception analyzing {section_name}: {str(e)}")
+            logger.error("Exception analyzing %s: %s", section_name, e)
             return f"Analysis failed: {str(e)}"
             
     def _analyze_with_direct_api(self, content: Dict[str, str], query: str, 
@@ -211,12 +218,13 @@ class BaseClaudeService:
         Returns:
             Analysis result from Claude
         """
-        logger.info(f"Using direct API for {section_name}")
+        logger.info("Using direct API for %s", section_name)
         
         # Format content for Claude
-        formatted_content = ""
-        for path, file_content in content.items():
-            formatted_content += f"\n\n# File: {path}\n```\n{file_content}\n```\n"
+        formatted_content = "".join(
+            f"\n\n# File: {path}\n```\n{file_content}\n```\n"
+            for path, file_content in content.items()
+        )
         
         # Create system message with context if available
         system_message = f"Analyze the code section named '{section_name}'."
@@ -244,16 +252,17 @@ class BaseClaudeService:
                 ]
             }
             
-            # Use the API client's headers for authentication
-            response = req.post(
+            # Reuse the API client's session and authentication headers
+            api_client = self.batch_analyzer.api_client
+            response = api_client.session.post(
                 "https://api.anthropic.com/v1/messages",
-                headers=self.batch_analyzer.api_client.headers,
+                headers=api_client.headers,
                 json=data,
                 timeout=120  # Increase timeout for direct API calls
             )
             
             if response.status_code != 200:
-                logger.error(f"API error: {response.status_code} - {response.text}")
+                logger.error("API error: %s - %s", response.status_code, response.text)
                 return f"Analysis failed: API error {response.status_code}"
                 
             # Parse the response
@@ -268,7 +277,7 @@ class BaseClaudeService:
             
             return text_content
         except Exception as e:
-            logger.error(f"Direct API call failed: {str(e)}")
+            logger.error("Direct API call failed: %s", e)
             return f"Analysis failed: {str(e)}"
     
     def extract_context(self, analysis: str, max_size: int = 1500) -> str:
@@ -286,25 +295,20 @@ class BaseClaudeService:
         # Split by paragraphs or sections
         paragraphs = [p.strip() for p in analysis.split('\n\n') if p.strip()]
         
-        # Prefer paragraphs that have key indicators of important insights
-        key_indicators = ['purpose', 'main', 'functionality', 'core', 'responsible', 
-                        'primary', 'key', 'important', 'essential', 'relates to']
-        
-        # Score paragraphs by relevance
-        scored_paragraphs = []
-        for p in paragraphs:
-            score = 0
-            for indicator in key_indicators:
-                if indicator.lower() in p.lower():
-                    score += 1
-            scored_paragraphs.append((score, p))
+        # Score paragraphs by how many distinct key indicators they contain
+        scored_paragraphs = [
+            (len(set(_KEY_INDICATOR_REGEX.findall(p.lower()))), p)
+            for p in paragraphs
+        ]
         
-        # Sort by score (highest first)
-        scored_paragraphs.sort(reverse=True)
+        # Every paragraph taken uses at least 3 characters (text plus newlines), so the
+        # loop below never looks past the first max_size // 3 + 1 paragraphs by score.
+        # Select just those (highest first) instead of sorting all of them.
+        top_paragraphs = heapq.nlargest(max_size // 3 + 1, scored_paragraphs)
         
         # Take top paragraphs up to max_size
         context = ""
-        for _, p in scored_paragraphs:
+        for _, p in top_paragraphs:
             if len(context) + len(p) + 2 <= max_size:  # +2 for newline
                 context += p + "\n\n"
             else:
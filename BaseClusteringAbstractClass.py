@@ -1,12 +1,16 @@
 from abc import ABC, abstractmethod
 import logging
 import os
-from typing import Dict, List, Tuple, Any, Optional, Set
+from html import escape
+from typing import Dict, List, Tuple, Any, Optional, Set, Iterator
 from pathlib import Path
 from collections import defaultdict
 
 logger = logging.getLogger(__name__)
 
+# Characters replaced with underscores when building section anchors
+_ANCHOR_TRANSLATION = str.maketrans('/.', '__')
+
 class BaseRepositoryAnalyzer(ABC):
     """
     Abstract base class for repository analysis and clustering.
@@ -32,7 +36,8 @@ class BaseRepositoryAnalyzer(ABC):
                            auto_filter: bool = True) -> List[Tuple[str, Dict[str, str]]]:
         """
         Analyze repository and divide it into logical sections.
-        This method must be implemented by all concrete analyzer classes.
+        This method must be implemented by all concrete analyzer classes, and must
+        treat repo_files as read-only so callers can pass it without copying.
         
         Args:
             repo_files: Dictionary mapping file paths to contents
@@ -57,51 +62,68 @@ class BaseRepositoryAnalyzer(ABC):
         Returns:
             Markdown index document
         """
+        return "".join(self.iter_section_index(sections, analyses))
+    
+    def iter_section_index(self, sections: List[Tuple[str, Dict[str, str]]], 
+                           analyses: Dict[str, str]) -> Iterator[str]:
+        """
+        Generate the section index as a stream of markdown chunks.
+        Lets callers write the index straight to a file without building it in memory.
+        
+        Args:
+            sections: List of (section_name, files) tuples
+            analyses: Dictionary mapping section names to their analyses
+            
+        Yields:
+            Consecutive chunks of the markdown index document
+        """
         # Build a table of contents
-        toc_parts = ["# Repository Analysis Index\n\n"]
-        toc_parts.append("## Sections\n\n")
+        yield "# Repository Analysis Index\n\n"
+        yield "## Sections\n\n"
+        
+        # Map section names to their files for constant-time lookups
+        sections_map = dict(sections)
+        
+        # Create a sanitized anchor link for each section once, for both the TOC and the headings
+        anchors = {
+            section_name: section_name.translate(_ANCHOR_TRANSLATION).lower()
+            for section_name in sections_map
+        }
         
         # Group sections by top-level directory
         grouped_sections = defaultdict(list)
         for section_name, _ in sections:
-            top_level = section_name.split('/')[0]
+            top_level = section_name.split('/', 1)[0]
             grouped_sections[top_level].append(section_name)
         
         # Add TOC entries for each group
         for group, section_names in sorted(grouped_sections.items()):
-            toc_parts.append(f"### {group}\n\n")
+            yield f"### {group}\n\n"
             for section_name in sorted(section_names):
                 # Get file count
-                _, files = next((s, f) for s, f in sections if s == section_name)
-                file_count = len(files)
-                
-                # Create a sanitized anchor link
-                anchor = section_name.replace('/', '_').replace('.', '_').lower()
-                toc_parts.append(f"- [{section_name}](#{anchor}) ({file_count} files)\n")
-            toc_parts.append("\n")
+                file_count = len(sections_map[section_name])
+                yield f"- [{section_name}](#{anchors[section_name]}) ({file_count} files)\n"
+            yield "\n"
         
         # Add section analyses
-        toc_parts.append("## Analysis by Section\n\n")
+        yield "## Analysis by Section\n\n"
         
         for section_name, files in sections:
-            anchor = section_name.replace('/', '_').replace('.', '_').lower()
-            toc_parts.append(f"<h3 id='{anchor}'>{section_name} ({len(files)} files)</h3>\n\n")
+            # Section names can come from Claude, so escape them inside the raw HTML heading
+            yield f"<h3 id='{escape(anchors[section_name])}'>{escape(section_name)} ({len(files)} files)</h3>\n\n"
             
             # List the files in this section
-            toc_parts.append("**Files:**\n\n")
-            for path in sorted(files.keys()):
-                toc_parts.append(f"- `{path}`\n")
-            toc_parts.append("\n")
+            yield "**Files:**\n\n"
+            yield "".join(f"- `{path}`\n" for path in sorted(files))
+            yield "\n"
             
             # Add the analysis
             if section_name in analyses:
-                toc_parts.append("**Analysis:**\n\n")
-                toc_parts.append(analyses[section_name])
-                toc_parts.append("\n\n---\n\n")
+                yield "**Analysis:**\n\n"
+                yield analyses[section_name]
+                yield "\n\n---\n\n"
             else:
-                toc_parts.append("*No analysis available for this section.*\n\n---\n\n")
-        
-        return "".join(toc_parts)
+                yield "*No analysis available for this section.*\n\n---\n\n"
     
     def filter_important_files(self, repo_files: Dict[str, str]) -> Dict[str, str]:
         """
@@ -157,6 +179,24 @@ class BaseRepositoryAnalyzer(ABC):
         logger.info(f"Basic filter kept {len(filtered_files)} files out of {len(repo_files)} total")
         return filtered_files
     
+    def finalize_sections(self, sections: List[Tuple[str, Dict[str, str]]],
+                          min_section_size: int) -> List[Tuple[str, Dict[str, str]]]:
+        """
+        Apply the last steps of cluster_repository to a list of sections.
+        Callers that cluster with min_section_size=1 (e.g. to cache unmerged sections)
+        use this to get the same result as clustering with the real minimum.
+        
+        Args:
+            sections: List of (section_name, files) tuples
+            min_section_size: Minimum number of files in a section
+            
+        Returns:
+            List of final sections
+        """
+        if min_section_size > 1:
+            sections = self._merge_small_sections(sections, min_section_size)
+        return sections
+    
     def _merge_small_sections(self, sections: List[Tuple[str, Dict[str, str]]], 
                             min_size: int) -> List[Tuple[str, Dict[str, str]]]:
         """
@@ -189,50 +229,81 @@ class BaseRepositoryAnalyzer(ABC):
         parent_groups = defaultdict(list)
         for name, files in small_sections:
             # Use first part of the section name as the parent category
-            parent = name.split('/')[0]
+            parent = name.split('/', 1)[0]
             parent_groups[parent].append((name, files))
         
-        # Merge small sections within the same parent category
+        # Merge small sections within the same parent category. Each merged section is
+        # kept as the list of file dicts it came from, and only combined into one dict
+        # once its final destination is known.
         merged_sections = []
         for parent, group_sections in parent_groups.items():
             if not group_sections:
                 continue
                 
-            # Merge files from all sections in this group
-            merged_files = {}
-            for _, files in group_sections:
-                merged_files.update(files)
+            # Claude clusters can share a file, so count each path once
+            merged_parts = [files for _, files in group_sections]
+            merged_size = len(set().union(*merged_parts))
             
             # If the merged section is large enough, add it
-            if len(merged_files) >= min_size:
+            if merged_size >= min_size:
                 # Create a name based on the parent and number of merged sections
                 if len(group_sections) > 1:
                     merged_name = f"{parent}/merged_{len(group_sections)}_sections"
                 else:
                     merged_name = group_sections[0][0]
-                merged_sections.append((merged_name, merged_files))
+                merged_sections.append((merged_name, merged_parts, merged_size))
             else:
                 # If still too small, add to a pending list for further merging
-                merged_sections.append((f"{parent}/small_files", merged_files))
+                merged_sections.append((f"{parent}/small_files", merged_parts, merged_size))
         
         # Final step: handle any remaining small sections
         final_merged_sections = []
-        misc_files = {}
+        misc_parts = []
         
-        for name, files in merged_sections:
-            if len(files) >= min_size:
-                final_merged_sections.append((name, files))
+        for name, parts, size in merged_sections:
+            if size >= min_size:
+                final_merged_sections.append((name, self._combine_files(parts)))
             else:
                 # Add to miscellaneous bucket
-                misc_files.update(files)
+                misc_parts.extend(parts)
         
         # If we have miscellaneous files, create a section for them
-        if misc_files:
-            final_merged_sections.append(("miscellaneous", misc_files))
+        if misc_parts:
+            final_merged_sections.append(("miscellaneous", self._combine_files(misc_parts)))
         
         # Return large sections plus merged small sections
         return large_sections + final_merged_sections
     
+    @staticmethod
+    def section_files(paths: List[str], repo_files: Dict[str, str]) -> Dict[str, str]:
+        """
+        Project a list of paths onto the repository files.
+        Grouping code works on path lists and calls this once per final section.
+        
+        Args:
+            paths: File paths belonging to a section
+            repo_files: Dictionary mapping file paths to contents
+            
+        Returns:
+            Dictionary mapping the section's paths to their contents
+        """
+        return {path: repo_files[path] for path in paths}
+    
+    @staticmethod
+    def _combine_files(parts: List[Dict[str, str]]) -> Dict[str, str]:
+        """
+        Combine several file dictionaries into a single one.
+        
+        Args:
+            parts: Dictionaries mapping file paths to contents
+            
+        Returns:
+            Single dictionary containing the files of every part
+        """
+        if len(parts) == 1:
+            return parts[0]
+        return {path: content for files in parts for path, content in files.items()}
+    
     def _analyze_with_claude(self, content: Dict[str, str], query: str, section_name: str, context: Optional[str] = None) -> str:
         """
         Helper method to analyze content with Claude if available.
@@ -82,9 +82,10 @@ class BatchClaudeAnalyzer:
         
         for section_name, files in sections:
             # Format the files for Claude
-            files_content = ""
-            for path, content in files.items():
-                files_content += f"\n\n### File: {path}\n```\n{content}\n```\n"
+            files_content = "".join(
+                f"\n\n### File: {path}\n```\n{content}\n```\n"
+                for path, content in files.items()
+            )
             
             # Get context for this section if available
             section_context = context_map.get(section_name) if context_map else None
@@ -130,8 +131,14 @@ class BatchClaudeAnalyzer:
                     }
                 ]
             
-            # Sanitize the custom_id to ensure it meets API requirements
-            sanitized_id = self._sanitize_custom_id(section_name)
+            # Sanitize the custom_id to ensure it meets API requirements, keeping it
+            # unique when different section names sanitize to the same ID
+            base_id = self._sanitize_custom_id(section_name)
+            sanitized_id = base_id
+            suffix = 1
+            while sanitized_id in sanitized_to_original:
+                suffix += 1
+                sanitized_id = self._sanitize_custom_id(f"{base_id[:56]}_{suffix}")
             sanitized_to_original[sanitized_id] = section_name
             
             # Create the batch request entry
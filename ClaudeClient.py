@@ -7,14 +7,37 @@ import re
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 
+try:
+    # Optional: C-backed JSON decoding for batch results
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# orjson's decode errors subclass json.JSONDecodeError, so callers catch either
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+# Patterns for pulling JSON out of Claude's responses, compiled once
+_JSON_FENCE_REGEX = re.compile(r'```json\s*([\s\S]*?)\s*```')
+_CODE_FENCE_REGEX = re.compile(r'```\s*([\s\S]*?)\s*```')
+_BRACE_REGEX = re.compile(r'(\{[\s\S]*\})')
+
+# Heuristics used to rank context sections when trimming context
+_BLANK_LINE_REGEX = re.compile(r'\n\s*\n')
+_CODE_ENTITY_REGEX = re.compile(r'class\s+\w+|function\s+\w+|method\s+\w+', re.IGNORECASE)
+_RELATIONSHIP_REGEX = re.compile(r'relates|connects|interfaces|communicates with', re.IGNORECASE)
+_KEY_TERM_REGEX = re.compile(r'purpose|primary|main|key|core|essential', re.IGNORECASE)
+
 class ClaudeAPIClient:
     """
     Base client for interacting with Claude API with optimization features.
     This client provides core functionality for both individual and batch requests.
     """
     
+    # API keys that already passed the connection test in this process
+    _verified_api_keys = set()
+    
     def __init__(self, api_key=None):
         """
         Initialize the Claude API client.
@@ -34,13 +57,18 @@ class ClaudeAPIClient:
             "content-type": "application/json"
         }
         
-        # Validate API key with a simple test
-        try:
-            self._test_api_connection()
-            logger.info("Successfully connected to Anthropic API")
-        except Exception as e:
-            logger.error(f"Failed to connect to Anthropic API: {e}")
-            raise
+        # Session so polling and follow-up requests reuse the same connection
+        self.session = req.Session()
+        
+        # Validate API key with a simple test, once per key and process
+        if self.api_key not in ClaudeAPIClient._verified_api_keys:
+            try:
+                self._test_api_connection()
+                logger.info("Successfully connected to Anthropic API")
+            except Exception as e:
+                logger.error("Failed to connect to Anthropic API: %s", e)
+                raise
+            ClaudeAPIClient._verified_api_keys.add(self.api_key)
     
     def _test_api_connection(self):
         """Test the API connection with a simple request."""
@@ -51,7 +79,7 @@ class ClaudeAPIClient:
             "messages": [{"role": "user", "content": "Hello, this is a test."}]
         }
         
-        response = req.post(
+        response = self.session.post(
             "https://api.anthropic.com/v1/messages",
             headers=self.headers,
             json=data,
@@ -77,10 +105,10 @@ class ClaudeAPIClient:
         """
         try:
             # Create batch
-            logger.info(f"Creating batch with {len(request_list)} requests")
+            logger.info("Creating batch with %s requests", len(request_list))
             
             # Use the renamed module
-            create_response = req.post(  # Use req instead of requests
+            create_response = self.session.post(
                 "https://api.anthropic.com/v1/messages/batches",
                 headers=self.headers,
                 json={"requests": request_list},  # Use the renamed parameter
@@ -88,18 +116,18 @@ class ClaudeAPIClient:
             )
             
             if create_response.status_code != 200:
-                logger.error(f"Failed to create batch: {create_response.status_code} - {create_response.text}")
+                logger.error("Failed to create batch: %s - %s", create_response.status_code, create_response.text)
                 raise Exception(f"Failed to create batch: {create_response.text}")
             
             batch_data = create_response.json()
             batch_id = batch_data.get("id")
-            logger.info(f"Successfully created batch with ID: {batch_id}")
+            logger.info("Successfully created batch with ID: %s", batch_id)
             
             # Poll for batch completion
             return self._poll_batch_status(batch_id)
             
         except Exception as e:
-            logger.error(f"Error in batch request: {e}")
+            logger.error("Error in batch request: %s", e)
             return {}
     
     def _poll_batch_status(self, batch_id: str) -> Dict[str, Any]:
@@ -118,16 +146,16 @@ class ClaudeAPIClient:
         current_interval = initial_poll_interval
         
         for i in range(max_polls):
-            logger.info(f"Polling batch status (attempt {i+1}, interval: {current_interval}s)...")
+            logger.info("Polling batch status (attempt %s, interval: %ss)...", i+1, current_interval)
             
-            status_response = req.get(
+            status_response = self.session.get(
                 f"https://api.anthropic.com/v1/messages/batches/{batch_id}",
                 headers=self.headers,
                 timeout=30
             )
             
             if status_response.status_code != 200:
-                logger.error(f"Failed to get batch status: {status_response.status_code} - {status_response.text}")
+                logger.error("Failed to get batch status: %s - %s", status_response.status_code, status_response.text)
                 # Use exponential backoff for errors
                 time.sleep(min(current_interval * 2, 60))
                 current_interval = min(current_interval * 2, 60)
@@ -142,7 +170,7 @@ class ClaudeAPIClient:
             completed_requests = request_counts.get("completed", 0) + request_counts.get("failed", 0)
             progress = (completed_requests / total_requests * 100) if total_requests > 0 else 0
             
-            logger.info(f"Batch status: {processing_status}, Progress: {progress:.1f}% ({completed_requests}/{total_requests})")
+            logger.info("Batch status: %s, Progress: %.1f%% (%s/%s)", processing_status, progress, completed_requests, total_requests)
             
             # Check if batch has ended
             if processing_status == "ended":
@@ -165,7 +193,7 @@ class ClaudeAPIClient:
             # Wait before polling again with variable interval
             time.sleep(current_interval)
         
-        logger.error(f"Batch processing timed out after {max_polls} polling attempts")
+        logger.error("Batch processing timed out after %s polling attempts", max_polls)
         return {}
     
     def _retrieve_batch_results(self, results_url: str) -> Dict[str, str]:
@@ -178,12 +206,12 @@ class ClaudeAPIClient:
         Returns:
             Dictionary mapping custom_ids to text content
         """
-        logger.info(f"Retrieving batch results from: {results_url}")
+        logger.info("Retrieving batch results from: %s", results_url)
         
-        response = req.get(results_url, headers=self.headers, timeout=60)
+        response = self.session.get(results_url, headers=self.headers, timeout=60)
         
         if response.status_code != 200:
-            logger.error(f"Failed to retrieve batch results: {response.status_code} - {response.text}")
+            logger.error("Failed to retrieve batch results: %s - %s", response.status_code, response.text)
             return {}
         
         results = {}
@@ -191,7 +219,7 @@ class ClaudeAPIClient:
         # Process the JSONL response
         for line in response.text.strip().split('\n'):
             try:
-                result_data = json.loads(line)
+                result_data = _json_loads(line)
                 custom_id = result_data.get("custom_id")
                 result = result_data.get("result", {})
                 
@@ -209,12 +237,12 @@ class ClaudeAPIClient:
                 else:
                     error_type = result.get("error", {}).get("type", "unknown")
                     error_message = result.get("error", {}).get("message", "Unknown error")
-                    logger.error(f"Error processing item '{custom_id}': {error_type} - {error_message}")
+                    logger.error("Error processing item '%s': %s - %s", custom_id, error_type, error_message)
                     results[custom_id] = f"Error: {error_message}"
             except json.JSONDecodeError:
-                logger.error(f"Failed to parse result line: {line}")
+                logger.error("Failed to parse result line: %s", line)
         
-        logger.info(f"Successfully retrieved results for {len(results)} items")
+        logger.info("Successfully retrieved results for %s items", len(results))
         return results
         
     def get_timestamp(self):
@@ -274,7 +302,7 @@ class OptimizedPromptManager:
             return context
             
         # Split by sections (assuming sections are separated by blank lines)
-        sections = re.split(r'\n\s*\n', context)
+        sections = _BLANK_LINE_REGEX.split(context)
         
         # Score and prioritize sections
         scored_sections = []
@@ -287,15 +315,15 @@ class OptimizedPromptManager:
                 score += 5
                 
             # Higher score for sections mentioning functions/classes/key components
-            if re.search(r'class\s+\w+|function\s+\w+|method\s+\w+', section, re.IGNORECASE):
+            if _CODE_ENTITY_REGEX.search(section):
                 score += 3
                 
             # Higher score for sections describing relationships
-            if re.search(r'relates|connects|interfaces|communicates with', section, re.IGNORECASE):
+            if _RELATIONSHIP_REGEX.search(section):
                 score += 4
                 
             # Higher score for sections with key terms
-            if re.search(r'purpose|primary|main|key|core|essential', section, re.IGNORECASE):
+            if _KEY_TERM_REGEX.search(section):
                 score += 2
                 
             # Add the scored section
@@ -333,17 +361,17 @@ class OptimizedPromptManager:
             Extracted JSON string
         """
         # Try to find JSON within ```json ... ``` blocks
-        json_match = re.search(r'```json\s*([\s\S]*?)\s*```', text)
+        json_match = _JSON_FENCE_REGEX.search(text)
         if json_match:
             return json_match.group(1)
         
         # Try to find JSON within any ``` ... ``` blocks
-        code_match = re.search(r'```\s*([\s\S]*?)\s*```', text)
+        code_match = _CODE_FENCE_REGEX.search(text)
         if code_match:
             return code_match.group(1)
         
         # Look for JSON-like structures with { ... }
-        brace_match = re.search(r'(\{[\s\S]*\})', text)
+        brace_match = _BRACE_REGEX.search(text)
         if brace_match:
             return brace_match.group(1)
         
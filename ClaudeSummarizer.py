@@ -2,11 +2,26 @@ import os
 import logging
 import time
 from typing import List, Dict, Tuple, Any, Optional
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from BaseClaudeService import BaseClaudeService
 
 
 logger = logging.getLogger(__name__)
 
+# Map common extensions to language for syntax highlighting
+_LANGUAGE_BY_EXTENSION = {
+    '.py': "python", '.pyw': "python",
+    '.js': "javascript", '.jsx': "javascript", '.ts': "javascript", '.tsx': "javascript",
+    '.html': "html", '.htm': "html",
+    '.css': "css",
+    '.json': "json",
+    '.md': "markdown", '.markdown': "markdown",
+    '.c': "cpp", '.cpp': "cpp", '.h': "cpp", '.hpp': "cpp",
+    '.java': "java",
+    '.rb': "ruby"
+}
+
 class ClaudeSummarizer(BaseClaudeService):
     """
     Handles Claude-based summarization of code sections with context preservation
@@ -92,66 +107,68 @@ class ClaudeSummarizer(BaseClaudeService):
         analyses = {}
         accumulated_context = ""
         
-        logger.info(f"Starting analysis of {len(sections)} sections with{' context' if use_context else 'out context'}")
+        logger.info("Starting analysis of %s sections %s", len(sections), "with context" if use_context else "without context")
         
-        # Process sections sequentially
-        for i, (section_name, files) in enumerate(sections):
-            logger.info(f"Processing section {i+1}/{len(sections)}: {section_name} ({len(files)} files)")
-            
-            # Check if section is too large (rough estimation)
-            estimated_tokens = sum(len(content) for content in files.values()) // 4
-            
-            # If section is very large, split it
-            if estimated_tokens > 150000:  # Set a threshold below Claude's limit
-                logger.info(f"Section {section_name} is large (est. {estimated_tokens} tokens), splitting for processing")
-                # Create context to use if applicable
-                context_to_use = None
-                if use_context and accumulated_context:
-                    context_to_use = f"Previously analyzed sections revealed: {accumulated_context}"
-                result = self._process_large_section(section_name, files, query, context_to_use, use_context, accumulated_context, model, use_batch)
-            else:
-                # Format files for Claude
-                section_content = self._format_files_for_claude(files)
+        # Process sections sequentially. Analysis files are written by a background
+        # thread, so saving one section overlaps the request for the next one.
+        with ThreadPoolExecutor(max_workers=1) as writer:
+            for i, (section_name, files) in enumerate(sections):
+                logger.info("Processing section %s/%s: %s (%s files)", i+1, len(sections), section_name, len(files))
                 
-                # Get context for this section if enabled
-                context_to_use = None
-                if use_context and accumulated_context:
-                    context_to_use = f"Previously analyzed sections revealed: {accumulated_context}"
+                # Check if section is too large (rough estimation)
+                estimated_tokens = sum(len(content) for content in files.values()) // 4
                 
-                # Enhance query with contextual guidance if we have context
-                effective_query = query
-                if context_to_use:
-                    effective_query = f"{query}\n\nConsider these insights from other sections: {accumulated_context}"
+                # If section is very large, split it
+                if estimated_tokens > 150000:  # Set a threshold below Claude's limit
+                    logger.info("Section %s is large (est. %s tokens), splitting for processing", section_name, estimated_tokens)
+                    # Create context to use if applicable
+                    context_to_use = None
+                    if use_context and accumulated_context:
+                        context_to_use = f"Previously analyzed sections revealed: {accumulated_context}"
+                    result = self._process_large_section(section_name, files, query, context_to_use, use_context, accumulated_context, model, use_batch)
+                else:
+                    # Format files for Claude
+                    section_content = self._format_files_for_claude(files)
+                    
+                    # Get context for this section if enabled
+                    context_to_use = None
+                    if use_context and accumulated_context:
+                        context_to_use = f"Previously analyzed sections revealed: {accumulated_context}"
+                    
+                    # Enhance query with contextual guidance if we have context
+                    effective_query = query
+                    if context_to_use:
+                        effective_query = f"{query}\n\nConsider these insights from other sections: {accumulated_context}"
+                    
+                    # Analyze the section
+                    result = self.analyze_with_claude(
+                        content=section_content,
+                        query=effective_query,
+                        section_name=section_name,
+                        context=context_to_use,
+                        use_batch=use_batch,
+                        model=model
+                    )
                 
-                # Analyze the section
-                result = self.analyze_with_claude(
-                    content=section_content,
-                    query=effective_query,
-                    section_name=section_name,
-                    context=context_to_use,
-                    use_batch=use_batch,
-                    model=model
-                )
-            
-            # Store the result
-            analyses[section_name] = result
-            
-            # Save to file in the repository-specific directory
-            self._save_analysis(section_name, result)
-            
-            # Update accumulated context if this wasn't an error
-            if not result.startswith("Analysis failed:") and use_context:
-                context_extract = self.extract_context(result)
-                accumulated_context += f"\n\n{section_name}: {context_extract}"
-                # Keep context from getting too large
-                if len(accumulated_context) > 6000:
-                    accumulated_context = accumulated_context[-6000:]
-            
-            # Small delay between requests to avoid rate limiting
-            if i < len(sections) - 1:
-                time.sleep(1)
+                # Store the result
+                analyses[section_name] = result
+                
+                # Save to file in the repository-specific directory
+                writer.submit(self._save_analysis, section_name, result)
+                
+                # Update accumulated context if this wasn't an error
+                if not result.startswith("Analysis failed:") and use_context:
+                    context_extract = self.extract_context(result)
+                    accumulated_context += f"\n\n{section_name}: {context_extract}"
+                    # Keep context from getting too large
+                    if len(accumulated_context) > 6000:
+                        accumulated_context = accumulated_context[-6000:]
                 
-        logger.info(f"Completed analysis of {len(sections)} sections")
+                # Small delay between requests to avoid rate limiting
+                if i < len(sections) - 1:
+                    time.sleep(1)
+                
+        logger.info("Completed analysis of %s sections", len(sections))
         return analyses
 
     def _process_large_section(self, section_name: str, files: Dict[str, str], 
@@ -161,7 +178,7 @@ class ClaudeSummarizer(BaseClaudeService):
         Process a section that is too large for a single Claude request.
         Splits the section into file-based batches, analyzes each, then synthesizes the results.
         """
-        logger.info(f"Processing large section {section_name} by splitting into manageable batches")
+        logger.info("Processing large section %s by splitting into manageable batches", section_name)
         
         # Group files into batches based on estimated token size
         batches = []
@@ -186,7 +203,7 @@ class ClaudeSummarizer(BaseClaudeService):
             
             # Handle files that are too large individually
             if file_display_tokens > 100000:
-                logger.warning(f"File {path} is too large ({file_tokens} tokens), processing separately")
+                logger.warning("File %s is too large (%s tokens), processing separately", path, file_tokens)
                 # Create a batch with just this truncated file
                 truncated_content = file_content[:400000] + "\n\n... [TRUNCATED: File too large to display completely]"
                 batches.append({path: truncated_content})
@@ -199,14 +216,15 @@ class ClaudeSummarizer(BaseClaudeService):
         if current_batch:
             batches.append(current_batch)
         
-        logger.info(f"Split section {section_name} into {len(batches)} batches")
+        logger.info("Split section %s into %s batches", section_name, len(batches))
         
         # Process each batch
         batch_analyses = []
+        previous_results = ""
         
         for i, batch_files in enumerate(batches):
             batch_name = f"{section_name}_batch_{i+1}"
-            logger.info(f"Processing {batch_name} with {len(batch_files)} files")
+            logger.info("Processing %s with %s files", batch_name, len(batch_files))
             
             # Format batch files for Claude
             batch_content = self._format_files_for_claude(batch_files)
@@ -220,8 +238,7 @@ class ClaudeSummarizer(BaseClaudeService):
             batch_context = context_to_use if use_context else None
             if i > 0 and batch_analyses:
                 # For later batches, add context from previous batch analyses
-                previous_results = "\n\n".join(batch_analyses[:i])
-                summary = f"Previous batches of this section contained: {previous_results[:4000]}..."
+                summary = f"Previous batches of this section contained: {previous_results}..."
                 batch_context = f"{context_to_use if context_to_use else ''}\n\n{summary}"
             elif use_context and accumulated_context and not context_to_use:
                 batch_context = f"Previously analyzed sections revealed: {accumulated_context}"
@@ -243,12 +260,20 @@ class ClaudeSummarizer(BaseClaudeService):
             # Store the batch result
             self._save_analysis(batch_name, batch_result)
             batch_analyses.append(batch_result)
+            
+            # Later batches only see the first 4000 characters of the earlier results,
+            # so stop extending the preview once it is full instead of re-joining them all
+            if len(previous_results) < 4000:
+                if len(batch_analyses) > 1:
+                    previous_results = f"{previous_results}\n\n{batch_result}"[:4000]
+                else:
+                    previous_results = batch_result[:4000]
 
             if i < len(batches) - 1:
-                logger.info(f"Waiting 60 seconds before processing next batch to avoid rate limits...")
+                logger.info("Waiting 60 seconds before processing next batch to avoid rate limits...")
                 time.sleep(60)  # Wait a full minute between batch processing
 
-        logger.info(f"Waiting 60 seconds before final synthesis to avoid rate limits...")
+        logger.info("Waiting 60 seconds before final synthesis to avoid rate limits...")
         time.sleep(60)
         
         # If only one batch (which can happen when all files are processed individually),
@@ -299,36 +324,17 @@ class ClaudeSummarizer(BaseClaudeService):
         formatted_output = {}
         
         # Create a combined file listing with syntax highlighting
-        files_content = ""
+        file_blocks = []
         for path, content in files.items():
             # Determine file extension for syntax highlighting
             ext = os.path.splitext(path)[1].lower()
             
-            # Map common extensions to language for syntax highlighting
-            lang = ""
-            if ext in ['.py', '.pyw']:
-                lang = "python"
-            elif ext in ['.js', '.jsx', '.ts', '.tsx']:
-                lang = "javascript"
-            elif ext in ['.html', '.htm']:
-                lang = "html"
-            elif ext in ['.css']:
-                lang = "css"
-            elif ext in ['.json']:
-                lang = "json"
-            elif ext in ['.md', '.markdown']:
-                lang = "markdown"
-            elif ext in ['.c', '.cpp', '.h', '.hpp']:
-                lang = "cpp"
-            elif ext in ['.java']:
-                lang = "java"
-            elif ext in ['.rb']:
-                lang = "ruby"
+            lang = _LANGUAGE_BY_EXTENSION.get(ext, "")
             
             # Add the file with syntax highlighting
-            files_content += f"\n\n## File: {path}\n```{lang}\n{content}\n```\n"
+            file_blocks.append(f"\n\n## File: {path}\n```{lang}\n{content}\n```\n")
         
-        formatted_output["code_files.md"] = f"# Code Files\n{files_content}"
+        formatted_output["code_files.md"] = "# Code Files\n" + "".join(file_blocks)
         return formatted_output
     
     def _save_analysis(self, section_name: str, analysis: str) -> None:
@@ -342,12 +348,9 @@ class ClaudeSummarizer(BaseClaudeService):
         try:
             # Create a safe filename
             section_filename = section_name.replace('/', '_').replace('\\', '_')
-            filepath = os.path.join(self.current_output_dir, f"{section_filename}.md")
+            filepath = Path(self.current_output_dir) / f"{section_filename}.md"
+            filepath.write_text(f"# {section_name}\n\n{analysis}", encoding="utf-8")
             
-            with open(filepath, "w", encoding="utf-8") as f:
-                f.write(f"# {section_name}\n\n")
-                f.write(analysis)
-                
-            logger.info(f"Saved analysis for '{section_name}' to {filepath}")
+            logger.info("Saved analysis for '%s' to %s", section_name, filepath)
         except Exception as e:
-            logger.error(f"Failed to save analysis for '{section_name}': {str(e)}")
\ No newline at end of file
+            logger.error("Failed to save analysis for '%s': %s", section_name, e)
\ No newline at end of file
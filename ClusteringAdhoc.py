@@ -1,15 +1,78 @@
+import os
 from pathlib import Path
-from typing import List, Dict, Tuple, Set, Optional, Any
+from typing import List, Dict, Tuple, Set, Optional, Any, Iterator, Collection
 from collections import defaultdict
+from operator import itemgetter
 import re
 import logging
-import networkx as nx
 from enum import Enum, auto
 
+try:
+    # Optional: C-backed keyword matching for file classification
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 from BaseClusteringAbstractClass import BaseRepositoryAnalyzer
 
 logger = logging.getLogger(__name__)
 
+# Common patterns in SDKs: APIs, models, utilities, tests, etc.
+# Order matters: the first pattern that matches a file name wins.
+_SUBDIVISION_PATTERNS = [
+    (r'api|client', 'apis'),
+    (r'model|schema|type', 'models'),
+    (r'util|helper|common', 'utilities'),
+    (r'test|spec', 'tests'),
+    (r'config|settings', 'configuration'),
+    (r'exception|error', 'errors'),
+    (r'auth|security', 'authentication'),
+    (r'logger|logging', 'logging'),
+    (r'db|database|storage', 'storage'),
+    (r'http|request', 'networking'),
+    (r'ui|view', 'ui'),
+    (r'transform|converter', 'transforms'),
+    (r'mock|fake|stub', 'mocks'),
+]
+
+# Fused regex: each alternative is a lookahead anchored at the start, so the
+# alternatives are tried in list order and match.lastgroup names the winner
+_SUBDIVISION_REGEX = re.compile(
+    '^(?:' + '|'.join(f'(?=.*?(?:{pattern}))(?P<{group}>)' for pattern, group in _SUBDIVISION_PATTERNS) + ')',
+    re.IGNORECASE | re.DOTALL
+)
+
+def _build_keyword_automaton():
+    """
+    Build an Aho-Corasick automaton over the literal keywords in _SUBDIVISION_PATTERNS.
+    
+    Returns:
+        Automaton mapping each keyword to (pattern priority, group), or None if
+        pyahocorasick is not installed
+    """
+    if ahocorasick is None:
+        return None
+    
+    automaton = ahocorasick.Automaton()
+    for priority, (pattern, group) in enumerate(_SUBDIVISION_PATTERNS):
+        for keyword in pattern.split('|'):
+            # Keep the highest-priority group when a keyword appears twice
+            if keyword not in automaton:
+                automaton.add_word(keyword, (priority, group))
+    automaton.make_automaton()
+    return automaton
+
+_KEYWORD_AUTOMATON = _build_keyword_automaton()
+
+# Python import statements at the start of a line: "import X[ as Y]" or "from X import Y"
+_PYTHON_IMPORT_REGEX = re.compile(r'^[ \t]*(?:import\s+([\w.]+)|from\s+([\w.]+)\s+import\b)', re.MULTILINE)
+
+# Standard library modules that never resolve to repository files
+_STDLIB_MODULES = frozenset({
+    'os', 'sys', 'time', 'datetime', 'json', 're', 'math', 'random',
+    'collections', 'typing', 'pathlib'
+})
+
 class AnalysisMethod(Enum):
     """Enum for different section analysis methods."""
     STRUCTURAL = auto()  # Original directory-based method
@@ -66,10 +129,7 @@ class BasicSectionAnalyzer(BaseRepositoryAnalyzer):
             sections = self.structural_analysis(repo_files, max_section_size)
         
         # Apply minimum section size if specified
-        if min_section_size > 1:
-            sections = self._merge_small_sections(sections, min_section_size)
-            
-        return sections
+        return self.finalize_sections(sections, min_section_size)
     
     def structural_analysis(self, repo_files: Dict[str, str], 
                         max_section_size: int = 15) -> List[Tuple[str, Dict[str, str]]]:
@@ -95,8 +155,8 @@ class BasicSectionAnalyzer(BaseRepositoryAnalyzer):
             # Add file to its directory section
             dir_sections[dir_path][path] = content
         
-        # Sort sections by name for consistent output
-        return sorted([(section, files) for section, files in dir_sections.items()], key=lambda x: x[0])
+        # Sort sections by name for consistent output (names are unique dict keys)
+        return sorted(dir_sections.items())
     
     def dependency_analysis(self, repo_files: Dict[str, str], 
                           max_section_size: int = 15) -> List[Tuple[str, Dict[str, str]]]:
@@ -113,46 +173,41 @@ class BasicSectionAnalyzer(BaseRepositoryAnalyzer):
         # First, extract import relationships between files
         dependencies = self._extract_dependencies(repo_files)
         
-        # Create a directed graph of dependencies
-        G = nx.DiGraph()
-        
-        # Add all files as nodes
-        for path in repo_files.keys():
-            G.add_node(path)
-        
-        # Add edges based on dependencies
-        for source, targets in dependencies.items():
-            for target in targets:
-                if target in repo_files:  # Only add edges to files we have
-                    G.add_edge(source, target)
-        
-        # Find strongly connected components (files that form cycles)
-        components = list(nx.strongly_connected_components(G))
-        
-        # If networkx is unavailable, fall back to simple grouping
-        if not components:
-            logger.warning("NetworkX strongly connected components failed, using simple grouping")
-            return self._fallback_dependency_grouping(repo_files, dependencies, max_section_size)
-        
         # Build initial sections from connected components
         sections = []
         unassigned_files = set(repo_files.keys())
         
-        # First, handle strongly connected components
-        for i, component in enumerate(components):
-            if len(component) > 1:  # Only use components with at least 2 files
-                component_files = {path: repo_files[path] for path in component if path in repo_files}
-                if component_files:
-                    # Use a common prefix if available
-                    prefix = self._find_common_prefix(component_files.keys())
-                    section_name = f"{prefix}_component_{i+1}" if prefix else f"component_{i+1}"
-                    sections.append((section_name, component_files))
-                    unassigned_files -= component_files.keys()
+        # Without internal imports there are no cycles, so skip the component search
+        if any(dependencies.values()):
+            # Files that neither import nor are imported by another file are weakly
+            # connected components of size one, so leave them out of the search. The
+            # remaining paths keep their repo_files order, and dropping those singletons
+            # doesn't change the order (or numbering) of the larger components.
+            linked = {path for path, targets in dependencies.items() if targets}
+            linked.update(*dependencies.values())
+            linked_nodes = dict.fromkeys(path for path in repo_files if path in linked)
+            
+            # Find strongly connected components (files that form cycles), using the
+            # dependency map directly as the adjacency list. Only components with at
+            # least 2 files are used, so singletons are dropped as they are produced.
+            components = (
+                component
+                for component in self._strongly_connected_components(linked_nodes, dependencies)
+                if len(component) > 1
+            )
+            
+            for i, component in enumerate(components, 1):
+                component_files = self.section_files(component, repo_files)
+                # Use a common prefix if available
+                prefix = self._find_common_prefix(component_files.keys())
+                section_name = f"{prefix}_component_{i}" if prefix else f"component_{i}"
+                sections.append((section_name, component_files))
+                unassigned_files -= component_files.keys()
         
         # Then, assign remaining files to sections based on common imports
         if unassigned_files:
             modular_sections = self._group_by_dependencies(
-                {path: repo_files[path] for path in unassigned_files},
+                self.section_files(unassigned_files, repo_files),
                 dependencies,
                 max_section_size
             )
@@ -168,7 +223,76 @@ class BasicSectionAnalyzer(BaseRepositoryAnalyzer):
             else:
                 final_sections.append((section_name, files))
         
-        return sorted(final_sections, key=lambda x: x[0])
+        return sorted(final_sections, key=itemgetter(0))
+    
+    def _strongly_connected_components(self, nodes: Collection[str],
+                                       dependencies: Dict[str, Set[str]]) -> Iterator[Set[str]]:
+        """
+        Find strongly connected components with an iterative Tarjan search.
+        
+        Components are yielded in the same order as networkx's
+        strongly_connected_components for the equivalent DiGraph.
+        
+        Args:
+            nodes: Graph nodes (file paths), in an ordered collection with fast
+                membership tests such as a dict. Iteration order decides the
+                order of the components.
+            dependencies: Map of file paths to the file paths they import
+            
+        Yields:
+            Sets of file paths, one per component
+        """
+        index = {}
+        lowlink = {}
+        stack = []
+        on_stack = set()
+        counter = 0
+        
+        for root in nodes:
+            if root in index:
+                continue
+            
+            index[root] = lowlink[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(dependencies.get(root, ())))]
+            
+            while work:
+                node, successors = work[-1]
+                descended = False
+                for target in successors:
+                    if target not in nodes:  # Only follow edges to files we have
+                        continue
+                    if target not in index:
+                        index[target] = lowlink[target] = counter
+                        counter += 1
+                        stack.append(target)
+                        on_stack.add(target)
+                        work.append((target, iter(dependencies.get(target, ()))))
+                        descended = True
+                        break
+                    if target in on_stack and index[target] < lowlink[node]:
+                        lowlink[node] = index[target]
+                if descended:
+                    continue
+                
+                # All successors visited: pop this node and propagate its lowlink
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    if lowlink[node] < lowlink[parent]:
+                        lowlink[parent] = lowlink[node]
+                
+                if lowlink[node] == index[node]:
+                    component = set()
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.add(member)
+                        if member == node:
+                            break
+                    yield component
     
     def hybrid_analysis(self, repo_files: Dict[str, str], 
                        max_section_size: int = 15) -> List[Tuple[str, Dict[str, str]]]:
@@ -189,17 +313,19 @@ class BasicSectionAnalyzer(BaseRepositoryAnalyzer):
         dir_sections = defaultdict(dict)
         
         for path, content in repo_files.items():
-            # Get the top-level directory
-            parts = Path(path).parts
-            if len(parts) >= 1:
-                section = parts[0]
-            else:
-                section = "root"
+            # Get the top-level directory (GitHub paths always use '/' separators)
+            section = path.split('/', 1)[0] or "root"
             
             dir_sections[section][path] = content
         
-        # Extract dependencies for potential refinement
-        dependencies = self._extract_dependencies(repo_files)
+        # Only sections over the size limit are refined, and their dependency subgraphs
+        # never leave the section, so only extract dependencies for those files
+        large_section_files = {
+            path: content
+            for files in dir_sections.values() if len(files) > max_section_size
+            for path, content in files.items()
+        }
+        dependencies = self._extract_dependencies(large_section_files) if large_section_files else {}
         
         # Refine sections based on size and dependencies
         refined_sections = []
@@ -212,8 +338,8 @@ class BasicSectionAnalyzer(BaseRepositoryAnalyzer):
                 try:
                     # Create subgraph for just this section
                     section_deps = {
-                        src: {tgt for tgt in deps if tgt in files}
-                        for src, deps in dependencies.items() if src in files
+                        src: {tgt for tgt in dependencies[src] if tgt in files}
+                        for src in files if src in dependencies
                     }
                     
                     # Get dependency-based subsections
@@ -238,7 +364,7 @@ class BasicSectionAnalyzer(BaseRepositoryAnalyzer):
                     pattern_subsections = self._subdivide_section(section_name, files, max_section_size)
                     refined_sections.extend(pattern_subsections)
         
-        return sorted(refined_sections, key=lambda x: x[0])
+        return sorted(refined_sections, key=itemgetter(0))
     
     def _extract_dependencies(self, repo_files: Dict[str, str]) -> Dict[str, Set[str]]:
         """
@@ -266,47 +392,34 @@ class BasicSectionAnalyzer(BaseRepositoryAnalyzer):
                     module_name = '.'.join(parts)
                 path_to_module[module_name] = path
         
-        # Extract Python imports
-        python_import_patterns = [
-            # from X import Y
-            r'from\s+([\w.]+)\s+import\s+[\w, \t\n]+',
-            # import X
-            r'import\s+([\w.]+)',
-            # import X as Y
-            r'import\s+([\w.]+)\s+as\s+\w+',
-        ]
-        
         # Look for imports in Python files
         for path, content in repo_files.items():
             if path.endswith('.py'):
-                for pattern in python_import_patterns:
-                    for match in re.finditer(pattern, content):
-                        imported_module = match.group(1)
-                        
-                        # Skip standard library imports
-                        if imported_module.split('.')[0] in {'os', 'sys', 'time', 'datetime', 
-                                                          'json', 're', 'math', 'random',
-                                                          'collections', 'typing', 'pathlib'}:
-                            continue
-                        
-                        # Try to resolve the import to a file path
-                        resolved_paths = set()
-                        
-                        # Try direct match
-                        if imported_module in path_to_module:
-                            resolved_paths.add(path_to_module[imported_module])
-                        
-                        # Try parent modules (for from X.Y import Z)
-                        parts = imported_module.split('.')
-                        for i in range(1, len(parts)):
-                            parent = '.'.join(parts[:-i])
-                            if parent in path_to_module:
-                                resolved_paths.add(path_to_module[parent])
-                        
-                        # Add dependencies
-                        for resolved_path in resolved_paths:
-                            if resolved_path != path:  # Avoid self-references
-                                dependencies[path].add(resolved_path)
+                for match in _PYTHON_IMPORT_REGEX.finditer(content):
+                    imported_module = match.group(1) or match.group(2)
+                    
+                    # Skip standard library imports
+                    if imported_module.split('.', 1)[0] in _STDLIB_MODULES:
+                        continue
+                    
+                    # Try to resolve the import to a file path
+                    resolved_paths = set()
+                    
+                    # Try direct match
+                    if imported_module in path_to_module:
+                        resolved_paths.add(path_to_module[imported_module])
+                    
+                    # Try parent modules (for from X.Y import Z)
+                    parts = imported_module.split('.')
+                    for i in range(1, len(parts)):
+                        parent = '.'.join(parts[:-i])
+                        if parent in path_to_module:
+                            resolved_paths.add(path_to_module[parent])
+                    
+                    # Add dependencies
+                    for resolved_path in resolved_paths:
+                        if resolved_path != path:  # Avoid self-references
+                            dependencies[path].add(resolved_path)
         
         return dependencies
     
@@ -335,18 +448,18 @@ class BasicSectionAnalyzer(BaseRepositoryAnalyzer):
         for dir_name, paths in dir_groups.items():
             if len(paths) <= max_section_size:
                 # Small enough to keep as one group
-                section_files = {p: repo_files[p] for p in paths}
-                sections.append((f"dir_{dir_name}", section_files))
+                sections.append((f"dir_{dir_name}", self.section_files(paths, repo_files)))
             else:
                 # Create an undirected dependency graph
                 shared_deps = defaultdict(set)
+                no_deps = frozenset()
                 for i, path1 in enumerate(paths):
+                    deps1 = dependencies.get(path1, no_deps)
                     for path2 in paths[i+1:]:
                         # Check if they share dependencies
-                        deps1 = dependencies.get(path1, set())
-                        deps2 = dependencies.get(path2, set())
+                        deps2 = dependencies.get(path2, no_deps)
                         # Also check for direct dependencies
-                        if path2 in deps1 or path1 in deps2 or deps1.intersection(deps2):
+                        if path2 in deps1 or path1 in deps2 or not deps1.isdisjoint(deps2):
                             shared_deps[path1].add(path2)
                             shared_deps[path2].add(path1)
                 
@@ -371,8 +484,8 @@ class BasicSectionAnalyzer(BaseRepositoryAnalyzer):
                                           if p not in assigned and p not in to_check)
                     
                     # Add group as a section
-                    section_files = {p: repo_files[p] for p in group}
-                    name_base = Path(list(group)[0]).stem.replace('.', '_')
+                    section_files = self.section_files(group, repo_files)
+                    name_base = Path(next(iter(group))).stem.replace('.', '_')
                     sections.append((f"{dir_name}_{name_base}_group", section_files))
         
         return sections
@@ -429,7 +542,7 @@ class BasicSectionAnalyzer(BaseRepositoryAnalyzer):
             unassigned = set(files.keys())
             
             for i, community in enumerate(community_groups):
-                community_files = {path: files[path] for path in community if path in files}
+                community_files = self.section_files([path for path in community if path in files], files)
                 if community_files:
                     # Find common prefix if possible
                     prefix = self._find_common_prefix(community_files.keys())
@@ -446,7 +559,7 @@ class BasicSectionAnalyzer(BaseRepositoryAnalyzer):
             
             # Handle unassigned files
             if unassigned:
-                leftover_files = {path: files[path] for path in unassigned}
+                leftover_files = self.section_files(unassigned, files)
                 # Group by extension
                 by_extension = defaultdict(dict)
                 for path, content in leftover_files.items():
@@ -480,24 +593,22 @@ class BasicSectionAnalyzer(BaseRepositoryAnalyzer):
         if not paths:
             return ""
             
-        # Convert to Path objects and get parts
-        path_parts = [Path(p).parts for p in paths]
+        # Split into parts (GitHub paths always use '/' separators)
+        path_parts = [p.split('/') for p in paths]
         
-        # Find common prefix length
+        # Common prefix length is the first position where any path differs
+        first = path_parts[0]
         min_len = min(len(parts) for parts in path_parts)
-        prefix_parts = []
+        common_len = next(
+            (i for i in range(min_len) if any(parts[i] != first[i] for parts in path_parts)),
+            min_len
+        )
         
-        for i in range(min_len):
-            if all(parts[i] == path_parts[0][i] for parts in path_parts):
-                prefix_parts.append(path_parts[0][i])
-            else:
-                break
-        
-        if not prefix_parts:
+        if not common_len:
             return ""
             
         # Return the common prefix
-        return prefix_parts[-1]  # Just use the last directory in common
+        return first[common_len - 1]  # Just use the last directory in common
     
     def _subdivide_section(self, section_name: str, files: Dict[str, str], 
                          max_section_size: int = 15) -> List[Tuple[str, Dict[str, str]]]:
@@ -512,69 +623,69 @@ class BasicSectionAnalyzer(BaseRepositoryAnalyzer):
         Returns:
             List of subdivided sections
         """
-        # Try to identify logical groups by file patterns
-        groups = defaultdict(dict)
+        # Try to identify logical groups by file patterns; groups hold paths only
+        # and are projected onto the file contents once their final split is known
+        groups = defaultdict(list)
         
         # Track files that have been assigned to a group
         assigned = set()
         
-        # Common patterns in SDKs: APIs, models, utilities, tests, etc.
-        patterns = [
-            (r'api|client', 'apis'),
-            (r'model|schema|type', 'models'),
-            (r'util|helper|common', 'utilities'),
-            (r'test|spec', 'tests'),
-            (r'config|settings', 'configuration'),
-            (r'exception|error', 'errors'),
-            (r'auth|security', 'authentication'),
-            (r'logger|logging', 'logging'),
-            (r'db|database|storage', 'storage'),
-            (r'http|request', 'networking'),
-            (r'ui|view', 'ui'),
-            (r'transform|converter', 'transforms'),
-            (r'mock|fake|stub', 'mocks'),
+        # Compute lowercased file name and extension once per file for both passes
+        entries = [
+            (path, path.rpartition('/')[2].lower(),
+             os.path.splitext(path)[1].lower().lstrip('.') or "unknown")
+            for path in files
         ]
         
         # First pass: check for specific patterns
-        for path, content in files.items():
-            file_name = Path(path).name.lower()
-            
+        for path, file_name, _ in entries:
             # Try to match against known patterns
-            for pattern, group in patterns:
-                if re.search(pattern, file_name, re.IGNORECASE):
-                    subsection = f"{section_name}/{group}"
-                    groups[subsection][path] = content
-                    assigned.add(path)
-                    break
+            group = self._classify_file_name(file_name)
+            if group:
+                subsection = f"{section_name}/{group}"
+                groups[subsection].append(path)
+                assigned.add(path)
         
         # Second pass: group by file extension for remaining files
-        for path, content in files.items():
+        for path, _, ext in entries:
             if path in assigned:
                 continue
                 
-            ext = Path(path).suffix.lower() or "unknown"
-            if ext.startswith('.'):
-                ext = ext[1:]  # Remove leading dot
-                
             subsection = f"{section_name}/{ext}_files"
-            groups[subsection][path] = content
-        
-        # Convert defaultdict to list of tuples
-        result = [(name, files) for name, files in groups.items()]
+            groups[subsection].append(path)
         
         # Further subdivide if any section is still too large
         final_result = []
-        for name, section_files in result:
-            if len(section_files) > max_section_size:
+        chunk_size = max_section_size // 2 + 1
+        for name, paths in groups.items():
+            if len(paths) > max_section_size:
                 # Use numeric chunking for still-large sections
-                chunks = self._chunk_by_size(section_files, max_section_size // 2 + 1)
-                for i, chunk in enumerate(chunks):
-                    final_result.append((f"{name}_part{i+1}", chunk))
+                for i, start in enumerate(range(0, len(paths), chunk_size)):
+                    chunk = paths[start:start + chunk_size]
+                    final_result.append((f"{name}_part{i+1}", self.section_files(chunk, files)))
             else:
-                final_result.append((name, section_files))
+                final_result.append((name, self.section_files(paths, files)))
                 
         return final_result
     
+    def _classify_file_name(self, file_name: str) -> Optional[str]:
+        """
+        Find the subdivision group for a lowercased file name.
+        
+        Args:
+            file_name: Lowercased file name (without directories)
+            
+        Returns:
+            Group label of the first matching pattern, or None if nothing matches
+        """
+        if _KEYWORD_AUTOMATON is not None:
+            # Single linear scan; the lowest priority index is the first pattern in list order
+            best = min((value for _, value in _KEYWORD_AUTOMATON.iter(file_name)), default=None)
+            return best[1] if best else None
+        
+        match = _SUBDIVISION_REGEX.match(file_name)
+        return match.lastgroup if match else None
+    
     def _chunk_by_size(self, files: Dict[str, str], chunk_size: int) -> List[Dict[str, str]]:
         """
         Split files into chunks of approximately chunk_size.
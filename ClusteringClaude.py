@@ -1,15 +1,22 @@
 import os
 import json
 import logging
-import re
 from typing import Dict, List, Tuple, Set, Optional, Any
 from collections import defaultdict
-import networkx as nx
+from operator import itemgetter
 
 from BaseClusteringAbstractClass import BaseRepositoryAnalyzer
 
+try:
+    # Optional: C-backed JSON decoding for clustering responses
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+_json_loads = orjson.loads if orjson is not None else json.loads
+
 class LLMClusterAnalyzer(BaseRepositoryAnalyzer):
     """
     Analyze repository files using LLM-based clustering to create logical code sections.
@@ -57,9 +64,10 @@ class LLMClusterAnalyzer(BaseRepositoryAnalyzer):
             logger.info(f"Filtered to {len(repo_files)} important files for analysis")
         
         # Step 1: Create initial grouping by directory (for efficiency)
+        # Repository paths always use '/', so split off the directory with one rpartition
         dir_groups = defaultdict(dict)
         for path, content in repo_files.items():
-            dir_name = os.path.dirname(path) or "root"
+            dir_name = path.rpartition('/')[0] or "root"
             dir_groups[dir_name][path] = content
         
         sections = []
@@ -87,10 +95,22 @@ class LLMClusterAnalyzer(BaseRepositoryAnalyzer):
                     sections.append((section_name, section_files))
         
         # Apply minimum section size
-        if min_section_size > 1:
-            sections = self._merge_small_sections(sections, min_section_size)
+        return self.finalize_sections(sections, min_section_size)
+    
+    def finalize_sections(self, sections: List[Tuple[str, Dict[str, str]]],
+                          min_section_size: int) -> List[Tuple[str, Dict[str, str]]]:
+        """
+        Merge small sections and sort the result by section name.
         
-        return sorted(sections, key=lambda x: x[0])
+        Args:
+            sections: List of (section_name, files) tuples
+            min_section_size: Minimum number of files in a section
+            
+        Returns:
+            List of final sections sorted by name
+        """
+        sections = super().finalize_sections(sections, min_section_size)
+        return sorted(sections, key=itemgetter(0))
     
     def _summarize_files(self, files: Dict[str, str]) -> Dict[str, str]:
         """
@@ -105,7 +125,7 @@ class LLMClusterAnalyzer(BaseRepositoryAnalyzer):
         logger.info(f"Generating summaries for {len(files)} files")
         
         # Process files in batches to avoid overwhelmingly large requests
-        file_paths = list(files.keys())
+        file_paths = list(files)
         file_summaries = {}
         
         for i in range(0, len(file_paths), self.max_batch_size):
@@ -156,10 +176,10 @@ class LLMClusterAnalyzer(BaseRepositoryAnalyzer):
         logger.info(f"Generating clusters for {len(file_summaries)} files in directory: {dir_name}")
         
         # Create a prompt that includes all summaries
-        summary_text = ""
-        for path, summary in file_summaries.items():
-            file_name = os.path.basename(path)
-            summary_text += f"\n\nFile: {file_name}\nPath: {path}\nSummary: {summary}"
+        summary_text = "".join(
+            f"\n\nFile: {os.path.basename(path)}\nPath: {path}\nSummary: {summary}"
+            for path, summary in file_summaries.items()
+        )
         
         # Calculate the ideal number of clusters based on file count and max size
         total_files = len(file_summaries)
@@ -200,26 +220,19 @@ Choose descriptive cluster names that reflect the purpose of the grouped files.
         
         # Extract JSON from response
         try:
-            # Find JSON block in the response
+            # The outermost braces delimit the JSON object, whether or not it sits in a
+            # code fence, so a single find/rfind pass locates it
             json_start = clustering_response.find('{')
             json_end = clustering_response.rfind('}') + 1
             
             if json_start >= 0 and json_end > json_start:
                 json_str = clustering_response[json_start:json_end]
-                clusters = json.loads(json_str)
+                clusters = _json_loads(json_str)
                 logger.info(f"Successfully generated {len(clusters)} clusters")
                 return clusters
-            else:
-                # Try to find JSON in code blocks
-                json_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', 
-                                    clustering_response, re.DOTALL)
-                if json_match:
-                    clusters = json.loads(json_match.group(1))
-                    logger.info(f"Successfully extracted {len(clusters)} clusters from code block")
-                    return clusters
-                
-                logger.error("Could not find JSON in the response")
-                return self._fallback_clustering(file_summaries, original_files, max_cluster_size)
+            
+            logger.error("Could not find JSON in the response")
+            return self._fallback_clustering(file_summaries, original_files, max_cluster_size)
                 
         except Exception as e:
             logger.error(f"Error parsing clustering result: {e}")
@@ -245,7 +258,7 @@ Choose descriptive cluster names that reflect the purpose of the grouped files.
         # Try directory-based grouping first
         subdir_groups = defaultdict(list)
         for path in file_summaries.keys():
-            subdir = os.path.dirname(path)
+            subdir = path.rpartition('/')[0]
             if '/' in subdir:
                 # Use second-level directory
                 subdir = subdir.split('/', 1)[1]
@@ -1,6 +1,8 @@
 import os
+import re
 import base64
 import concurrent.futures
+import functools
 import logging
 from github import Github
 from typing import List, Dict, Any, Optional, Set
@@ -8,6 +10,22 @@ from RepositoryCache import RepoCache
 
 logger = logging.getLogger(__name__)
 
+def _make_repository_fetcher(github: Github):
+    """
+    Build the function that fetches PyGithub repository objects for one client.
+    It captures only the Github connection, so a client can memoize it without
+    holding a reference cycle back to itself.
+    
+    Args:
+        github: Authenticated PyGithub instance
+        
+    Returns:
+        Function taking (owner, repo) and returning the PyGithub Repository object
+    """
+    def fetch_repository(owner: str, repo: str):
+        return github.get_repo(f"{owner}/{repo}")
+    return fetch_repository
+
 class GithubClient:
     """Client that uses PyGithub to interact with repositories directly."""
     
@@ -27,6 +45,10 @@ class GithubClient:
             raise ValueError("GitHub token is required. Set it in .env file or pass directly.")
         
         self.github = Github(token)
+        
+        # Memoize repository objects per client (and so per token), so each file request
+        # doesn't re-fetch the repo
+        self._get_repository = functools.lru_cache(maxsize=32)(_make_repository_fetcher(self.github))
     
     def list_repository_files(self, owner: str, repo: str, path: str = "") -> List[Dict[str, Any]]:
         """
@@ -41,8 +63,8 @@ class GithubClient:
             List of file information dictionaries
         """
         try:
-            repository = self.github.get_repo(f"{owner}/{repo}")
-            logger.debug(f"Getting contents from repository {repository.name}, path: {path}")
+            repository = self._get_repository(owner, repo)
+            logger.debug("Getting contents from repository %s, path: %s", repository.name, path)
 
             contents = repository.get_contents(path)
             # Handle both single file and directory cases
@@ -61,9 +83,40 @@ class GithubClient:
             return result
         except Exception as e:
             error_msg = str(e)
-            logger.error(f"Error listing contents at '{path}': {error_msg}")
+            logger.error("Error listing contents at '%s': %s", path, error_msg)
             raise e
     
+    def list_repository_tree(self, owner: str, repo: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        List every file in the repository's default branch with one Git Trees API call.
+        
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            
+        Returns:
+            List of file information dictionaries (same format as list_repository_files),
+            or None if GitHub truncated the tree and it has to be walked directory by directory
+        """
+        repository = self._get_repository(owner, repo)
+        tree = repository.get_git_tree(repository.default_branch, recursive=True)
+        
+        if tree.raw_data.get("truncated"):
+            logger.info("Git tree for %s/%s is truncated, listing directories instead", owner, repo)
+            return None
+        
+        # Blobs are regular files; symlinks (mode 120000) and submodules are skipped
+        return [
+            {
+                "name": element.path.rsplit('/', 1)[-1],
+                "path": element.path,
+                "type": "file",
+                "size": element.size
+            }
+            for element in tree.tree
+            if element.type == "blob" and element.mode != "120000"
+        ]
+    
     def get_file_content(self, owner: str, repo: str, path: str) -> str:
         """
         Get the content of a file.
@@ -77,14 +130,14 @@ class GithubClient:
             Content of the file as string
         """
         try:
-            repository = self.github.get_repo(f"{owner}/{repo}")
+            repository = self._get_repository(owner, repo)
             content = repository.get_contents(path)
             
             if content.encoding == "base64":
                 return base64.b64decode(content.content).decode('utf-8')
             return content.content
         except Exception as e:
-            logger.error(f"Error getting content for file '{path}': {e}")
+            logger.error("Error getting content for file '%s': %s", path, e)
             raise
 
     
@@ -106,8 +159,8 @@ class GithubClient:
             include_patterns: Patterns to specifically include
             extensions: File extensions to include
             force_refresh: Whether to force a refresh of the cache
-            batch_size: Number of files to process in each batch
-            max_workers: Maximum number of concurrent workers for file fetching
+            batch_size: Number of fetched files between progress log messages
+            max_workers: Maximum number of concurrent workers for listing and fetching
             
         Returns:
             Dictionary mapping file paths to contents
@@ -116,111 +169,123 @@ class GithubClient:
         if self.use_cache and not force_refresh:
             cached_files = self.cache.get_repo_files(owner, repo)
             if cached_files:
-                logger.info(f"Using cached repository structure for {owner}/{repo}")
+                logger.info("Using cached repository structure for %s/%s", owner, repo)
                 return cached_files
 
 
         if ignore_dirs is None:
             ignore_dirs = ['.git', 'node_modules', '__pycache__', 'dist', 'build']
             
-        # Set up defaults for binary file extensions to skip
-        binary_extensions = [
+        # Set up defaults for binary file extensions to skip (tuples let str.endswith
+        # check every suffix in one call)
+        binary_extensions = (
             '.png', '.jpg', '.jpeg', '.gif', '.bmp', '.pdf', '.zip', 
             '.gz', '.tar', '.class', '.exe', '.dll', '.so'
-        ]
+        )
+        extension_suffixes = tuple(extensions) if extensions else ()
+        
+        # Paths containing any ignored directory name are skipped; one compiled
+        # alternation replaces a substring check per ignored directory
+        ignore_regex = re.compile("|".join(map(re.escape, ignore_dirs))) if ignore_dirs else None
         
         # Helper function to determine if a file should be included
         def should_include_file(path: str) -> bool:
             # Check extension filter
             if extensions:
-                if not any(path.endswith(ext) for ext in extensions):
+                if not path.endswith(extension_suffixes):
                     # Check include patterns as override
                     if include_patterns and any(pattern in path for pattern in include_patterns):
                         return True
                     return False
                 
             # Skip binary files
-            if any(path.endswith(ext) for ext in binary_extensions):
+            if path.endswith(binary_extensions):
                 return False
                 
             return True
         
-        # First, collect all file paths recursively
-        all_file_paths = []
+        # Get every file path from the Git tree in one call. Large repositories get a
+        # truncated tree, so fall back to walking the directories level by level.
+        future_to_path = {}
         visited_dirs = set()
         
-        def collect_file_paths(path: str = ""):
-            if path in visited_dirs:
-                return
-                
-            visited_dirs.add(path)
-            
+        try:
+            tree_files = self.list_repository_tree(owner, repo)
+        except Exception as e:
+            logger.warning("Could not fetch the Git tree for %s/%s, listing directories instead: %s", owner, repo, e)
+            tree_files = None
+        
+        def list_directory(path: str) -> List[Dict[str, Any]]:
             try:
-                items = self.list_repository_files(owner, repo, path)
+                return self.list_repository_files(owner, repo, path)
+            except Exception as e:
+                logger.error("Error collecting files in %s: %s", path, e)
+                return []
+        
+        # Start collection from root, or take the whole tree as a single listing. Each
+        # file is fetched as soon as it is found, so downloads overlap with the walk.
+        pending_dirs = [""] if tree_files is None else []
+        listings = [] if tree_files is None else [tree_files]
+        
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while pending_dirs or listings:
+                visited_dirs.update(pending_dirs)
+                next_dirs = []
+                
+                if pending_dirs:
+                    listings = executor.map(list_directory, pending_dirs)
                 
-                for item in items:
-                    item_path = item.get("path", "")
-                    item_type = item.get("type", "")
-                    item_size = item.get("size", 0)
-                    
-                    # Skip ignored directories and their children
-                    if any(ignored_dir in item_path for ignored_dir in ignore_dirs):
-                        logger.debug(f"Skipping ignored directory: {item_path}")
-                        continue
-                    
-                    if item_type == "dir":
-                        # Queue directory for traversal
-                        collect_file_paths(item_path)
+                for items in listings:
+                    for item in items:
+                        item_path = item.get("path", "")
+                        item_type = item.get("type", "")
+                        item_size = item.get("size", 0)
                         
-                    elif item_type == "file":
-                        # Apply filters
-                        if item_size > max_file_size:
-                            logger.debug(f"Skipping large file: {item_path} ({item_size} bytes)")
-                            continue
-                            
-                        if not should_include_file(item_path):
-                            logger.debug(f"Skipping file based on filters: {item_path}")
+                        # Skip ignored directories and their children
+                        if ignore_regex is not None and ignore_regex.search(item_path):
+                            logger.debug("Skipping ignored directory: %s", item_path)
                             continue
                         
-                        # Add to list of files to fetch
-                        all_file_paths.append(item_path)
-            except Exception as e:
-                logger.error(f"Error collecting files in {path}: {e}")
-        
-        # Start collection from root
-        collect_file_paths()
-        
-        if not all_file_paths:
-            logger.warning("No files found or all files were filtered out")
-            return {}
+                        if item_type == "dir":
+                            # Queue directory for the next level of traversal
+                            if item_path not in visited_dirs:
+                                next_dirs.append(item_path)
+                            
+                        elif item_type == "file":
+                            # Apply filters
+                            if item_size > max_file_size:
+                                logger.debug("Skipping large file: %s (%s bytes)", item_path, item_size)
+                                continue
+                                
+                            if not should_include_file(item_path):
+                                logger.debug("Skipping file based on filters: %s", item_path)
+                                continue
+                            
+                            # Start fetching the file on the shared pool
+                            future_to_path[executor.submit(self.get_file_content, owner, repo, item_path)] = item_path
+                
+                pending_dirs = next_dirs
+                listings = []
             
-        logger.info(f"Found {len(all_file_paths)} files to fetch")
-        
-        # Now fetch file contents in parallel batches
-        result = {}
-        
-        # Process files in batches to avoid overwhelming the API
-        for i in range(0, len(all_file_paths), batch_size):
-            batch = all_file_paths[i:i+batch_size]
-            logger.info(f"Processing batch {i//batch_size + 1}/{(len(all_file_paths) + batch_size - 1)//batch_size} ({len(batch)} files)")
+            if not future_to_path:
+                logger.warning("No files found or all files were filtered out")
+                return {}
             
-            # Use thread pool for concurrent fetching
-            with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-                # Create a dict mapping future to file path for easy lookup when results come in
-                future_to_path = {
-                    executor.submit(self.get_file_content, owner, repo, path): path 
-                    for path in batch
-                }
+            logger.info("Found %s files to fetch", len(future_to_path))
+            
+            # Process results as they complete; the pool size bounds concurrent API calls
+            result = {}
+            for fetched, future in enumerate(concurrent.futures.as_completed(future_to_path), 1):
+                path = future_to_path[future]
+                try:
+                    content = future.result()
+                    result[path] = content
+                    logger.debug("Added file: %s", path)
+                except Exception as e:
+                    logger.error("Error getting content for %s: %s", path, e)
                 
-                # Process results as they complete
-                for future in concurrent.futures.as_completed(future_to_path):
-                    path = future_to_path[future]
-                    try:
-                        content = future.result()
-                        result[path] = content
-                        logger.debug(f"Added file: {path}")
-                    except Exception as e:
-                        logger.error(f"Error getting content for {path}: {e}")
+                if fetched % batch_size == 0 or fetched == len(future_to_path):
+                    logger.info("Fetched %s/%s files", fetched, len(future_to_path))
         
         # Cache the results if enabled
         if self.use_cache and result:
@@ -1,8 +1,14 @@
 import requests as req
 import json
 import os
+from functools import lru_cache
 from dotenv import load_dotenv, find_dotenv
 
+@lru_cache(maxsize=1)
+def _load_env_once():
+    """Parse the .env file once per process, however many clients are created."""
+    load_dotenv()
+
 class JoplinClient:
     def __init__(self, token = None, port = 41184):
         """"
@@ -14,7 +20,7 @@ class JoplinClient:
         """
 
         if token is None:
-            load_dotenv()
+            _load_env_once()
             token = os.getenv("JOPLIN_TOKEN")
         
         if token is None:
@@ -26,6 +32,9 @@ class JoplinClient:
         self.base_url = f"http://localhost:{port}"
         self.NoteEndPoint = f"{self.base_url}/notes?token={self.token}"
         self.FolderEndPoint = f"{self.base_url}/folders?token={self.token}"
+        
+        # Keep one connection open to the Joplin server for all requests
+        self.session = req.Session()
 
 
 
@@ -50,7 +59,7 @@ class JoplinClient:
         if parent_id:
             data["parent_id"] = parent_id
         
-        response = req.post(self.NoteEndPoint, json=data)
+        response = self.session.post(self.NoteEndPoint, json=data)
 
         if response.status_code == 200:
             return response.json()
@@ -76,7 +85,7 @@ class JoplinClient:
         if parent_id:
             data["parent_id"] = parent_id
 
-        response = req.post(self.FolderEndPoint, json=data)
+        response = self.session.post(self.FolderEndPoint, json=data)
 
         if response.status_code == 200:
             return response.json()
@@ -87,7 +96,7 @@ class JoplinClient:
 
     def GetNotebook(self):
         """Get all notebooks (folders)."""
-        response = req.get(self.NoteEndPoint)
+        response = self.session.get(self.NoteEndPoint)
 
         if response.status_code == 200:
             return response.json()
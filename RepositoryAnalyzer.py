@@ -13,6 +13,13 @@ from RepositoryCache import RepoCache
 
 logger = logging.getLogger(__name__)
 
+# Command line section method names handled by the basic section analyzer
+_METHOD_MAP = {
+    "structural": AnalysisMethod.STRUCTURAL,
+    "dependency": AnalysisMethod.DEPENDENCY,
+    "hybrid": AnalysisMethod.HYBRID
+}
+
 class RepositoryAnalyzer:
     """
     Coordinates the repository analysis process, including file extraction,
@@ -31,7 +38,10 @@ class RepositoryAnalyzer:
         self.github_client = github_client
         self.claude_summarizer = claude_summarizer
         self.use_cache = use_cache
-        self.cache = RepoCache() if use_cache else None
+        self.cache = None
+        if use_cache:
+            # Share the client's cache so repository files are loaded and kept in memory once
+            self.cache = getattr(github_client, "cache", None) or RepoCache()
     
     def analyze_repository(self, args):
         """
@@ -105,19 +115,42 @@ class RepositoryAnalyzer:
                 section_method = self._get_analysis_method(args.section_method)
                 logger.info(f"Using {section_method.name} analysis method for basic section analyzer")
             
+            # Reuse sections from a previous run over identical files and settings.
+            # The cache holds sections before small ones are merged, so runs that only
+            # differ in min_section_size share the same clustering result.
+            sections = None
+            files_hash = None
+            settings_key = self._create_settings_key(args)
+            if self.cache and not args.no_cache:
+                files_hash = self.cache.get_files_hash(repo_files)
+                cached_map = self.cache.get_sections(args.owner, args.repo, files_hash, settings_key)
+                if cached_map is not None:
+                    sections = [
+                        (section, analyzer.section_files(paths, repo_files))
+                        for section, paths in cached_map.items()
+                    ]
+                    logger.info(f"Using cached sections for {args.owner}/{args.repo}")
+            
             # Identify logical sections
-            sections = analyzer.cluster_repository(
-                repo_files, 
-                method=section_method,
-                max_section_size=args.max_section_size,
-                min_section_size=args.min_section_size,
-                auto_filter = args.auto_filter 
-            )
+            if sections is None:
+                sections = analyzer.cluster_repository(
+                    repo_files, 
+                    method=section_method,
+                    max_section_size=args.max_section_size,
+                    min_section_size=1,  # Small sections are merged below, after caching
+                    auto_filter = args.auto_filter 
+                )
+                if files_hash:
+                    unmerged_map = {section: list(files) for section, files in sections}
+                    self.cache.cache_sections(args.owner, args.repo, files_hash, settings_key, unmerged_map)
+            
+            # Apply minimum section size the same way cluster_repository would
+            sections = analyzer.finalize_sections(sections, args.min_section_size)
             
             logger.info(f"Identified {len(sections)} logical sections")
             
             # Save section mapping for reference
-            section_map = {section: list(files.keys()) for section, files in sections}
+            section_map = {section: list(files) for section, files in sections}
             with open(os.path.join(repo_output_dir, "sections.json"), "w") as f:
                 json.dump(section_map, f, indent=2)
             
@@ -130,29 +163,43 @@ class RepositoryAnalyzer:
                 model=args.claude_model
             )
             
-            # Create the index file with a unique name
-            index = analyzer.create_section_index(sections, analyses)
+            # Create the index file with a unique name, streaming it to disk
             index_path = self._create_unique_index_path(repo_output_dir, args.owner, args.repo)
             with open(index_path, "w") as f:
-                f.write(index)
+                f.writelines(analyzer.iter_section_index(sections, analyses))
                 
             logger.info(f"Analysis complete. Index written to {index_path}")
             return True
             
         except Exception as e:
-            logger.error(f"Error: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error: %s", e)
             return False
     
+    def _create_settings_key(self, args) -> str:
+        """
+        Build the part of the section cache key that depends on the analysis settings.
+        min_section_size is left out because cached sections are stored before merging.
+        
+        Args:
+            args: Command line arguments object
+            
+        Returns:
+            Key string identifying the analysis method and its settings
+        """
+        settings = [
+            args.section_method,
+            args.max_section_size,
+            args.auto_filter
+        ]
+        # LLM clustering results also depend on the model
+        if args.section_method == "llm_cluster":
+            settings.append(args.claude_model)
+        
+        return ":".join(str(setting) for setting in settings)
+    
     def _get_analysis_method(self, method_name: str) -> AnalysisMethod:
         """Convert string method name to AnalysisMethod enum."""
-        method_map = {
-            "structural": AnalysisMethod.STRUCTURAL,
-            "dependency": AnalysisMethod.DEPENDENCY,
-            "hybrid": AnalysisMethod.HYBRID
-        }
-        return method_map.get(method_name.lower(), AnalysisMethod.STRUCTURAL)
+        return _METHOD_MAP.get(method_name.lower(), AnalysisMethod.STRUCTURAL)
     
     def _create_repo_output_dir(self, owner: str, repo: str, base_output_dir: str) -> str:
         """
@@ -1,30 +1,80 @@
 import os
+import gzip
 import json
+import hashlib
+import pickle
 import logging
 import time
 from pathlib import Path
 from typing import Dict, Optional, List, Set, Tuple, Any
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
+
+try:
+    # Optional: C-backed JSON encoding for the section and structure caches
+    import orjson
+except ImportError:
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+def _load_json(path: str) -> Any:
+    """
+    Load a JSON cache file.
+    
+    Args:
+        path: Path of the JSON file
+        
+    Returns:
+        Decoded JSON data
+    """
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def _dump_json(data: Any, path: str, indent: bool = False) -> None:
+    """
+    Write data to a JSON cache file as UTF-8.
+    
+    Args:
+        data: JSON-serializable data
+        path: Path of the JSON file
+        indent: Whether to pretty-print with two-space indentation
+    """
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0))
+        return
+    
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2 if indent else None)
+
 class RepoCache:
     """
     Cache for storing repository file contents to avoid repeated API calls.
     """
     
-    def __init__(self, cache_dir: str = "cache"):
+    def __init__(self, cache_dir: str = "cache", max_memory_entries: int = 8):
         """
         Initialize the repository cache.
         
         Args:
             cache_dir: Directory to store cache files
+            max_memory_entries: Number of repositories to keep in memory on top of the disk cache
         """
         self.cache_dir = cache_dir
         self.structure_dir = os.path.join(cache_dir, "structure")
+        self.sections_dir = os.path.join(cache_dir, "sections")
+        
+        # In-memory LRU of recently used repositories, keyed by (owner, repo)
+        self.max_memory_entries = max_memory_entries
+        self._memory_cache = OrderedDict()
         
         os.makedirs(cache_dir, exist_ok=True)
         os.makedirs(self.structure_dir, exist_ok=True)
+        os.makedirs(self.sections_dir, exist_ok=True)
     
     def get_cache_path(self, owner: str, repo: str) -> str:
         """
@@ -37,7 +87,7 @@ class RepoCache:
         Returns:
             Path to the cache file
         """
-        return os.path.join(self.cache_dir, f"{owner}_{repo}.json")
+        return os.path.join(self.cache_dir, f"{owner}_{repo}.pkl.gz")
     
     def get_structure_path(self, owner: str, repo: str) -> str:
         """
@@ -48,24 +98,128 @@ class RepoCache:
         """
         return os.path.join(self.structure_dir, f"{owner}_{repo}_structure.json")
     
+    def get_sections_path(self, owner: str, repo: str) -> str:
+        """
+        Get the file path for cached section analysis results.
+            
+        Returns:
+            Path to the sections file
+        """
+        return os.path.join(self.sections_dir, f"{owner}_{repo}_sections.json")
+    
+    def get_files_hash(self, files: Dict[str, str]) -> str:
+        """
+        Compute a content hash of repository files, used to key cached analysis results.
+        
+        Args:
+            files: Dictionary mapping file paths to contents
+            
+        Returns:
+            Hex digest that changes whenever any path or content changes
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        for path in sorted(files):
+            digest.update(path.encode('utf-8'))
+            digest.update(b"\0")
+            digest.update(files[path].encode('utf-8', errors='surrogatepass'))
+            digest.update(b"\0")
+        return digest.hexdigest()
+    
+    def get_sections(self, owner: str, repo: str, files_hash: str, 
+                     settings_key: str) -> Optional[Dict[str, List[str]]]:
+        """
+        Get a cached section mapping for a repository if one exists for these files and settings.
+        
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            files_hash: Content hash of the analyzed files (see get_files_hash)
+            settings_key: String identifying the analysis method and its settings
+            
+        Returns:
+            Dictionary mapping section names to file paths or None if not cached
+        """
+        sections_path = self.get_sections_path(owner, repo)
+        
+        if os.path.exists(sections_path):
+            try:
+                sections_data = _load_json(sections_path)
+                
+                if sections_data.get("files_hash") != files_hash:
+                    return None
+                
+                section_map = sections_data.get("analyses", {}).get(settings_key)
+                if section_map is not None:
+                    logger.info("Loaded %s cached sections for %s/%s", len(section_map), owner, repo)
+                return section_map
+            except Exception as e:
+                logger.error("Error loading sections cache for %s/%s: %s", owner, repo, e)
+                return None
+        
+        return None
+    
+    def cache_sections(self, owner: str, repo: str, files_hash: str, settings_key: str,
+                       section_map: Dict[str, List[str]]) -> bool:
+        """
+        Cache the section mapping produced by an analysis.
+        Results for other settings are kept as long as the files are unchanged.
+        
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            files_hash: Content hash of the analyzed files (see get_files_hash)
+            settings_key: String identifying the analysis method and its settings
+            section_map: Dictionary mapping section names to file paths
+            
+        Returns:
+            True if successfully cached, False otherwise
+        """
+        sections_path = self.get_sections_path(owner, repo)
+        
+        try:
+            sections_data = {}
+            if os.path.exists(sections_path):
+                sections_data = _load_json(sections_path)
+            
+            # Results for older file contents are stale, so start over
+            if sections_data.get("files_hash") != files_hash:
+                sections_data = {"files_hash": files_hash, "analyses": {}}
+            
+            sections_data["analyses"][settings_key] = section_map
+            
+            _dump_json(sections_data, sections_path)
+                
+            logger.info("Cached %s sections for %s/%s", len(section_map), owner, repo)
+            return True
+        except Exception as e:
+            logger.error("Error caching sections for %s/%s: %s", owner, repo, e)
+            return False
+    
     def get_repo_files(self, owner: str, repo: str) -> Optional[Dict[str, str]]:
         """
         Get repository files from cache if available.
             
         Returns:
-            Dictionary mapping file paths to contents or None if not cached
+            Dictionary mapping file paths to contents or None if not cached (a copy the
+            caller may modify)
         """
+        key = (owner, repo)
+        if key in self._memory_cache:
+            self._memory_cache.move_to_end(key)
+            return dict(self._memory_cache[key])
+        
         cache_path = self.get_cache_path(owner, repo)
         
         if os.path.exists(cache_path):
             try:
-                with open(cache_path, 'r', encoding='utf-8') as f:
-                    cache_data = json.load(f)
+                with gzip.open(cache_path, 'rb') as f:
+                    cache_data = pickle.load(f)
                     
-                logger.info(f"Loaded {len(cache_data)} files from cache for {owner}/{repo}")
+                logger.info("Loaded %s files from cache for %s/%s", len(cache_data), owner, repo)
+                self._remember(key, cache_data)
                 return cache_data
             except Exception as e:
-                logger.error(f"Error loading cache for {owner}/{repo}: {e}")
+                logger.error("Error loading cache for %s/%s: %s", owner, repo, e)
                 return None
         
         return None
@@ -83,17 +237,20 @@ class RepoCache:
         cache_path = self.get_cache_path(owner, repo)
         
         try:
-            with open(cache_path, 'w', encoding='utf-8') as f:
-                json.dump(files, f, ensure_ascii=False, indent=2)
+            # Binary pickle is much faster to write and load than indented JSON, and
+            # source code compresses well even at a fast gzip level
+            with gzip.open(cache_path, 'wb', compresslevel=3) as f:
+                pickle.dump(files, f, protocol=pickle.HIGHEST_PROTOCOL)
                 
-            logger.info(f"Cached {len(files)} files for {owner}/{repo}")
+            logger.info("Cached %s files for %s/%s", len(files), owner, repo)
+            self._remember((owner, repo), files)
             
             # When caching files, also update the repository structure cache
             self.cache_repo_structure(owner, repo, files)
             
             return True
         except Exception as e:
-            logger.error(f"Error caching repo {owner}/{repo}: {e}")
+            logger.error("Error caching repo %s/%s: %s", owner, repo, e)
             return False
     
     def cache_repo_structure(self, owner: str, repo: str, files: Dict[str, str]) -> bool:
@@ -122,13 +279,12 @@ class RepoCache:
                 "file_extensions": self._collect_file_extensions(files)
             }
             
-            with open(structure_path, 'w', encoding='utf-8') as f:
-                json.dump(structure_data, f, ensure_ascii=False, indent=2)
+            _dump_json(structure_data, structure_path, indent=True)
                 
-            logger.info(f"Updated structure cache for {owner}/{repo}")
+            logger.info("Updated structure cache for %s/%s", owner, repo)
             return True
         except Exception as e:
-            logger.error(f"Error updating structure cache for {owner}/{repo}: {e}")
+            logger.error("Error updating structure cache for %s/%s: %s", owner, repo, e)
             return False
     
     def get_repo_structure(self, owner: str, repo: str) -> Optional[Dict[str, Any]]:
@@ -142,13 +298,12 @@ class RepoCache:
         
         if os.path.exists(structure_path):
             try:
-                with open(structure_path, 'r', encoding='utf-8') as f:
-                    structure_data = json.load(f)
+                structure_data = _load_json(structure_path)
                     
-                logger.info(f"Loaded repository structure from cache for {owner}/{repo}")
+                logger.info("Loaded repository structure from cache for %s/%s", owner, repo)
                 return structure_data
             except Exception as e:
-                logger.error(f"Error loading structure cache for {owner}/{repo}: {e}")
+                logger.error("Error loading structure cache for %s/%s: %s", owner, repo, e)
                 return None
         
         # If structure cache doesn't exist but file cache does, generate structure
@@ -182,7 +337,7 @@ class RepoCache:
         # Filter files by directory
         directory_files = []
         for path in files.keys():
-            path_dir = os.path.dirname(path)
+            path_dir = path.rpartition('/')[0]
             # Check if this file is in the specified directory or a subdirectory
             if path_dir == directory or path_dir.startswith(f"{directory}/"):
                 directory_files.append(path)
@@ -200,26 +355,56 @@ class RepoCache:
         
         if owner and repo:
             # Clear specific repo cache
-            pattern = f"{owner}_{repo}*.json"
+            prefix = f"{owner}_{repo}"
         elif owner:
             # Clear all caches for owner
-            pattern = f"{owner}_*.json"
+            prefix = f"{owner}_"
         else:
             # Clear all caches
-            pattern = "*.json"
+            prefix = ""
+        
+        # Drop matching repositories from memory as well
+        for key in list(self._memory_cache):
+            if f"{key[0]}_{key[1]}".startswith(prefix):
+                del self._memory_cache[key]
+        
+        # File caches are compressed pickles, structure caches (and older file caches) are JSON
+        extensions = (".pkl.gz", ".pkl", ".json")
         
         # Clear from all cache directories
-        cache_dirs = [self.cache_dir, self.structure_dir]
+        cache_dirs = [self.cache_dir, self.structure_dir, self.sections_dir]
         
         for directory in cache_dirs:
-            for cache_file in Path(directory).glob(pattern):
-                try:
-                    os.remove(cache_file)
-                    count += 1
-                except Exception as e:
-                    logger.error(f"Error removing cache file {cache_file}: {e}")         
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if not (entry.name.startswith(prefix) and entry.name.endswith(extensions)):
+                        continue
+                    if not entry.is_file():
+                        continue
+                    try:
+                        os.remove(entry.path)
+                        count += 1
+                    except Exception as e:
+                        logger.error("Error removing cache file %s: %s", entry.path, e)
         return count
     
+    def _remember(self, key: Tuple[str, str], files: Dict[str, str]) -> None:
+        """
+        Store a copy of repository files in the in-memory LRU, evicting the least recently
+        used entry. Copying keeps later changes to the caller's dictionary out of the cache.
+        
+        Args:
+            key: (owner, repo) tuple
+            files: Dictionary mapping file paths to contents
+        """
+        if self.max_memory_entries <= 0:
+            return
+        
+        self._memory_cache[key] = dict(files)
+        self._memory_cache.move_to_end(key)
+        while len(self._memory_cache) > self.max_memory_entries:
+            self._memory_cache.popitem(last=False)
+    
     def _build_directory_structure(self, files: Dict[str, str]) -> Dict[str, Any]:
         """
         Build a hierarchical directory structure from file paths.
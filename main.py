@@ -121,9 +121,7 @@ def main():
             return 1
             
     except Exception as e:
-        logger.error(f"Error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error: %s", e)
         return 1
 
 if __name__ == "__main__":
@@ -0,0 +1,46 @@
+import os
+import sys
+from unittest.mock import MagicMock
+
+# Add parent directory to path (once, even when the module is imported again)
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from ClaudeBatchProcessor import BatchClaudeAnalyzer
+from ClaudeClient import ClaudeAPIClient
+
+def _offline_analyzer():
+    # Skip __init__, which needs an API key and tests the connection
+    analyzer = BatchClaudeAnalyzer.__new__(BatchClaudeAnalyzer)
+    analyzer.api_client = MagicMock(spec=ClaudeAPIClient)
+    analyzer.api_client.batch_request.side_effect = lambda requests: {
+        request["custom_id"]: f"analysis of {request['custom_id']}" for request in requests
+    }
+    analyzer.use_prompt_caching = False
+    return analyzer
+
+def test_colliding_section_names_get_unique_custom_ids():
+    analyzer = _offline_analyzer()
+    sections = [(name, {"main.py": "x = 1"}) for name in ["a/b", "a_b", "a.b"]]
+
+    results = analyzer.analyze_sections_batch(sections, query="Explain", model="test-model")
+
+    requests = analyzer.api_client.batch_request.call_args.args[0]
+    assert [request["custom_id"] for request in requests] == ["a_b", "a_b_2", "a_b_3"]
+    assert results == {
+        "a/b": "analysis of a_b",
+        "a_b": "analysis of a_b_2",
+        "a.b": "analysis of a_b_3",
+    }
+
+def test_colliding_long_section_names_stay_within_limit():
+    analyzer = _offline_analyzer()
+    long_name = "x" * 70
+    sections = [(name, {"main.py": "x = 1"}) for name in [long_name, long_name + "/a", long_name + "/b"]]
+
+    results = analyzer.analyze_sections_batch(sections, query="Explain", model="test-model")
+
+    custom_ids = [request["custom_id"] for request in analyzer.api_client.batch_request.call_args.args[0]]
+    assert custom_ids == ["x" * 64, "x" * 56 + "_2", "x" * 56 + "_3"]
+    assert set(results) == {name for name, _ in sections}
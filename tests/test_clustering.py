@@ -3,9 +3,16 @@ import sys
 import json
 import logging
 import argparse
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 from dotenv import load_dotenv
 
+try:
+    # Optional: C-backed JSON encoding for the result files
+    import orjson
+except ImportError:
+    orjson = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -13,19 +20,26 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Add parent directory to path to import project modules
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Add parent directory to path to import project modules (once per process)
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
 
 # Import the required modules
 from ClusteringAdhoc import BasicSectionAnalyzer, AnalysisMethod
-from ClusteringClaude import LLMClusterAnalyzer
-from ClaudeBatchProcessor import BatchClaudeAnalyzer
 from BaseClusteringAbstractClass import BaseRepositoryAnalyzer
 from GithubClient import GithubClient
 
 # Load environment variables
 load_dotenv()
 
+# Basic clustering methods selectable with --methods
+BASIC_METHODS = {
+    "structural": AnalysisMethod.STRUCTURAL,
+    "dependency": AnalysisMethod.DEPENDENCY,
+    "hybrid": AnalysisMethod.HYBRID
+}
+
 def parse_arguments():
     """Parse command line arguments."""
     parser = argparse.ArgumentParser(description="Test repository clustering methods")
@@ -40,6 +54,82 @@ def parse_arguments():
     
     return parser.parse_args()
 
+def write_json(data, path):
+    """
+    Write data to an indented JSON result file.
+    
+    Args:
+        data: JSON-serializable data
+        path: Output file path (pathlib.Path)
+    """
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        path.write_text(json.dumps(data, indent=2))
+
+def save_json(writer, data, path):
+    """
+    Queue a JSON result file on the background writer, logging any write failure.
+    
+    Args:
+        writer: Single-threaded executor that performs the writes
+        data: JSON-serializable data (must not be modified afterwards)
+        path: Output file path (pathlib.Path)
+    """
+    def log_failure(future):
+        if future.exception() is not None:
+            logger.error("Failed to write %s: %s", path, future.exception())
+    
+    writer.submit(write_json, data, path).add_done_callback(log_failure)
+
+def record_sections(sections, output_file, writer):
+    """
+    Build the result entry for one clustering method and save it as JSON.
+    
+    Args:
+        sections: List of (section_name, files) tuples, where files is a dict keyed
+                  by path or a list of paths
+        output_file: Path of the JSON file to write
+        writer: Executor used to write the file in the background
+        
+    Returns:
+        Dictionary with the section count and the files in each section
+    """
+    result = {
+        "section_count": len(sections),
+        "sections": {section_name: list(files) for section_name, files in sections}
+    }
+    save_json(writer, result, output_file)
+    return result
+
+def run_basic_method(analyzer, repo_files, method_name, method):
+    """
+    Cluster the repository with one BasicSectionAnalyzer method.
+    
+    Args:
+        analyzer: BasicSectionAnalyzer instance to use
+        repo_files: Dictionary mapping already filtered file paths to contents
+        method_name: Name of the method (for logging)
+        method: AnalysisMethod to run
+        
+    Returns:
+        List of (section_name, file_paths) tuples
+    """
+    logger.info("Testing %s clustering method...", method_name)
+    
+    # Files are filtered once up front by the caller, so skip per-method filtering
+    sections = analyzer.cluster_repository(
+        repo_files,
+        method=method,
+        max_section_size=15,
+        min_section_size=2,
+        auto_filter=False
+    )
+    
+    # This runs in a worker process; only the paths are needed, so don't pickle
+    # every file's contents back to the parent
+    return [(section_name, list(files)) for section_name, files in sections]
+
 def main():
     """
     Main function to run clustering tests.
@@ -48,10 +138,10 @@ def main():
     args = parse_arguments()
     
     # Create output directory for test results
-    test_output_dir = args.output_dir
-    os.makedirs(test_output_dir, exist_ok=True)
+    test_output_dir = Path(args.output_dir)
+    test_output_dir.mkdir(parents=True, exist_ok=True)
     
-    logger.info(f"Test results will be saved to: {os.path.abspath(test_output_dir)}")
+    logger.info("Test results will be saved to: %s", test_output_dir.resolve())
     
     # Initialize GitHub client (handles caching internally)
     github_client = GithubClient(use_cache=not args.no_cache)
@@ -74,123 +164,109 @@ def main():
     
     logger.info(f"Loaded {len(repo_files)} files from repository")
     
-    # Save the list of files for reference
-    with open(os.path.join(test_output_dir, f"{repo_name}_files.json"), "w") as f:
-        json.dump(list(repo_files.keys()), f, indent=2)
-    
-    # Determine which methods to test
-    methods_to_test = []
-    test_llm = False
-    
-    if args.methods == "all":
-        methods_to_test = ["structural", "dependency", "hybrid"]
-    elif args.methods == "all_with_llm":
-        methods_to_test = ["structural", "dependency", "hybrid"]
-        test_llm = True
-    else:
-        methods_to_test = [args.methods]
-    
-    # Initialize the BasicSectionAnalyzer
-    basic_analyzer = BasicSectionAnalyzer()
-    
-    # Test each requested method
-    results = {}
-    
-    # Method mapping
-    method_map = {
-        "structural": AnalysisMethod.STRUCTURAL,
-        "dependency": AnalysisMethod.DEPENDENCY,
-        "hybrid": AnalysisMethod.HYBRID
+    # Cached repositories are returned whatever --max-file-size was used to fetch them,
+    # so apply the limit here before any clustering sees the files. The limit is in
+    # bytes like at fetch time, and files are decoded as UTF-8, so measure the encoding.
+    oversized = {
+        path for path, content in repo_files.items()
+        if len(content.encode('utf-8')) > args.max_file_size
     }
+    if oversized:
+        repo_files = {path: content for path, content in repo_files.items() if path not in oversized}
+        logger.info("Dropped %s files larger than %s bytes", len(oversized), args.max_file_size)
     
-    # Test BasicSectionAnalyzer methods
-    for method_name in methods_to_test:
-        method = method_map.get(method_name)
-        if not method:
-            continue
-            
-        logger.info(f"Testing {method_name} clustering method...")
+    # Result files are written by a background thread so saving one method's
+    # output overlaps with running the next; leaving the block waits for them
+    with ThreadPoolExecutor(max_workers=1) as writer:
+        # Save the list of files for reference
+        save_json(writer, list(repo_files), test_output_dir / f"{repo_name}_files.json")
+        
+        # Determine which methods to test
+        methods_to_test = []
+        test_llm = False
         
-        # Run the analyzer with auto_filter enabled
-        sections = basic_analyzer.cluster_repository(
-            repo_files.copy(),  # Use a copy to avoid modifying the original
-            method=method,
-            max_section_size=15,
-            min_section_size=2,
-            auto_filter=True
-        )
+        if args.methods == "all":
+            methods_to_test = ["structural", "dependency", "hybrid"]
+        elif args.methods == "all_with_llm":
+            methods_to_test = ["structural", "dependency", "hybrid"]
+            test_llm = True
+        else:
+            methods_to_test = [args.methods]
         
-        # Save results
-        section_data = {}
-        for section_name, files in sections:
-            section_data[section_name] = list(files.keys())
+        # Initialize the BasicSectionAnalyzer
+        basic_analyzer = BasicSectionAnalyzer()
         
-        results[f"basic_{method_name}"] = {
-            "section_count": len(sections),
-            "sections": section_data
-        }
+        # Test each requested method
+        results = {}
         
-        # Save to JSON file
-        output_file = os.path.join(test_output_dir, f"{repo_name}_{method_name}_sections.json")
-        with open(output_file, "w") as f:
-            json.dump(results[f"basic_{method_name}"], f, indent=2)
-            
-        logger.info(f"Created {len(sections)} sections using {method_name} method")
-    
-    # Test LLM clustering if requested
-    if test_llm:
-        logger.info("Testing LLM-based clustering method...")
+        # Test BasicSectionAnalyzer methods. The methods are independent and CPU-bound, so
+        # they run in separate processes and their results are saved in request order.
+        selected_methods = [(name, BASIC_METHODS[name]) for name in methods_to_test if name in BASIC_METHODS]
         
-        # Check if Claude API key is available
-        claude_api_key = os.getenv("CLAUDE_API_KEY")
-        if not claude_api_key:
-            logger.warning("No Claude API key found. LLM clustering test will be skipped.")
-        else:
-            # Initialize the batch analyzer
-            batch_analyzer = BatchClaudeAnalyzer()
-            
-            # Initialize the LLM analyzer
-            llm_analyzer = LLMClusterAnalyzer(
-                batch_analyzer=batch_analyzer,
-                max_batch_size=5
-            )
+        # Every basic method applies the same auto filter, so run it once and share the result
+        filtered_files = basic_analyzer.filter_important_files(repo_files) if selected_methods else {}
+        
+        with ProcessPoolExecutor(max_workers=max(len(selected_methods), 1)) as executor:
+            futures = [
+                (method_name, executor.submit(run_basic_method, basic_analyzer, filtered_files, method_name, method))
+                for method_name, method in selected_methods
+            ]
+        
+        for method_name, future in futures:
+            sections = future.result()
+        
+            # Save results
+            output_file = test_output_dir / f"{repo_name}_{method_name}_sections.json"
+            results[f"basic_{method_name}"] = record_sections(sections, output_file, writer)
             
-            # Run the LLM analyzer
-            sections = llm_analyzer.cluster_repository(
-                repo_files.copy(),  # Use a copy to avoid modifying the original
-                max_section_size=15,
-                min_section_size=2,
-                auto_filter=True
-            )
+            logger.info("Created %s sections using %s method", len(sections), method_name)
+        
+        # Test LLM clustering if requested
+        if test_llm:
+            logger.info("Testing LLM-based clustering method...")
+        
+            # Check if Claude API key is available
+            claude_api_key = os.getenv("CLAUDE_API_KEY")
+            if not claude_api_key:
+                logger.warning("No Claude API key found. LLM clustering test will be skipped.")
+            else:
+                # Imported here so the basic methods don't pay for loading the Claude client
+                from ClusteringClaude import LLMClusterAnalyzer
+                from ClaudeBatchProcessor import BatchClaudeAnalyzer
+                
+                # Initialize the batch analyzer
+                batch_analyzer = BatchClaudeAnalyzer()
             
-            # Save results
-            section_data = {}
-            for section_name, files in sections:
-                section_data[section_name] = list(files.keys())
+                # Initialize the LLM analyzer
+                llm_analyzer = LLMClusterAnalyzer(
+                    batch_analyzer=batch_analyzer,
+                    max_batch_size=5
+                )
             
-            results["llm"] = {
-                "section_count": len(sections),
-                "sections": section_data
-            }
+                # Run the LLM analyzer
+                sections = llm_analyzer.cluster_repository(
+                    repo_files,  # Analyzers never modify the files they are given
+                    max_section_size=15,
+                    min_section_size=2,
+                    auto_filter=True
+                )
             
-            # Save to JSON file
-            output_file = os.path.join(test_output_dir, f"{repo_name}_llm_sections.json")
-            with open(output_file, "w") as f:
-                json.dump(results["llm"], f, indent=2)
+                # Save results
+                output_file = test_output_dir / f"{repo_name}_llm_sections.json"
+                results["llm"] = record_sections(sections, output_file, writer)
                 
-            logger.info(f"Created {len(sections)} sections using LLM-based clustering")
-    
-    # Create and save summary
-    summary = {
-        "repository": f"{owner}/{repo_name}",
-        "total_files": len(repo_files),
-        "methods": {k: v["section_count"] for k, v in results.items()}
-    }
-    
-    # Save summary
-    summary_file = os.path.join(test_output_dir, f"{repo_name}_summary.json")
-    with open(summary_file, "w") as f:
-        json.dump(summary, f, indent=2)
+                logger.info("Created %s sections using LLM-based clustering", len(sections))
+        
+        # Create and save summary
+        summary = {
+            "repository": f"{owner}/{repo_name}",
+            "total_files": len(repo_files),
+            "methods": {k: v["section_count"] for k, v in results.items()}
+        }
+        
+        # Save summary
+        summary_file = test_output_dir / f"{repo_name}_summary.json"
+        save_json(writer, summary, summary_file)
     
     # Print summary to console
     logger.info("\n" + "="*50)
@@ -199,10 +275,10 @@ def main():
     logger.info("-"*50)
     
     for method, data in results.items():
-        logger.info(f"{method}: {data['section_count']} sections")
+        logger.info("%s: %s sections", method, data['section_count'])
     
     logger.info("-"*50)
-    logger.info(f"Results saved to: {os.path.abspath(test_output_dir)}")
+    logger.info("Results saved to: %s", test_output_dir.resolve())
     logger.info("="*50)
 
 if __name__ == "__main__":
@@ -0,0 +1,85 @@
+import os
+import sys
+import pytest
+
+# Add parent directory to path (once, even when the module is imported again)
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+import ClusteringAdhoc
+from ClusteringAdhoc import BasicSectionAnalyzer
+
+# Dependency graph with a three-file cycle, a two-file cycle, a plain edge, a
+# self-import and an import of a file that isn't part of the repository
+SCC_NODES = {path: "" for path in ["a.py", "b.py", "c.py", "d.py", "e.py", "f.py", "g.py"]}
+SCC_DEPENDENCIES = {
+    "a.py": {"b.py"},
+    "b.py": {"c.py"},
+    "c.py": {"a.py", "d.py"},
+    "d.py": {"e.py"},
+    "e.py": {"d.py", "missing.py"},
+    "f.py": {"g.py", "f.py"},
+}
+
+def test_strongly_connected_components():
+    components = list(BasicSectionAnalyzer()._strongly_connected_components(SCC_NODES, SCC_DEPENDENCIES))
+
+    assert sorted(sorted(component) for component in components) == [
+        ["a.py", "b.py", "c.py"], ["d.py", "e.py"], ["f.py"], ["g.py"]
+    ]
+
+def test_strongly_connected_components_match_networkx():
+    nx = pytest.importorskip("networkx")
+
+    graph = nx.DiGraph()
+    graph.add_nodes_from(SCC_NODES)
+    graph.add_edges_from(
+        (source, target)
+        for source, targets in SCC_DEPENDENCIES.items()
+        for target in targets
+        if target in SCC_NODES
+    )
+
+    components = list(BasicSectionAnalyzer()._strongly_connected_components(SCC_NODES, SCC_DEPENDENCIES))
+
+    # Same components in the same order as networkx
+    assert components == list(nx.strongly_connected_components(graph))
+
+def test_strongly_connected_components_ignore_unlinked_nodes():
+    # Files without any internal import, interleaved with the linked ones
+    all_nodes = dict.fromkeys(["lone_1.py", "f.py", "d.py", "lone_2.py", "a.py", "g.py", "e.py", "b.py", "c.py"])
+    linked = {path for path, targets in SCC_DEPENDENCIES.items() if targets}
+    linked.update(*SCC_DEPENDENCIES.values())
+    linked_nodes = dict.fromkeys(path for path in all_nodes if path in linked)
+
+    analyzer = BasicSectionAnalyzer()
+    full = [c for c in analyzer._strongly_connected_components(all_nodes, SCC_DEPENDENCIES) if len(c) > 1]
+    restricted = [c for c in analyzer._strongly_connected_components(linked_nodes, SCC_DEPENDENCIES) if len(c) > 1]
+
+    # Same multi-file components in the same order, so section numbering is unchanged
+    assert restricted == full
+    assert len(full) == 2
+
+# Lowercased file names and the subdivision group they fall into. Names matching
+# several patterns take the first one in _SUBDIVISION_PATTERNS order.
+CLASSIFIED_FILE_NAMES = [
+    ("api_client.py", "apis"),
+    ("user_model.py", "models"),
+    ("test_helpers.py", "utilities"),
+    ("http_errors.py", "errors"),
+    ("settings.json", "configuration"),
+    ("readme.md", None),
+]
+
+@pytest.mark.parametrize("use_automaton", [True, False])
+@pytest.mark.parametrize("file_name, group", CLASSIFIED_FILE_NAMES)
+def test_classify_file_name(monkeypatch, use_automaton, file_name, group):
+    if use_automaton:
+        if ClusteringAdhoc._KEYWORD_AUTOMATON is None:
+            pytest.skip("pyahocorasick not installed")
+    else:
+        # Force the regex fallback used when pyahocorasick is missing
+        monkeypatch.setattr(ClusteringAdhoc, "_KEYWORD_AUTOMATON", None)
+
+    assert BasicSectionAnalyzer()._classify_file_name(file_name) == group
@@ -0,0 +1,106 @@
+import base64
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+# Add parent directory to path (once, even when the module is imported again)
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from GithubClient import GithubClient
+
+# Entries of a recursive Git tree: a file, a directory, a symlink and a submodule
+TREE_ELEMENTS = [
+    SimpleNamespace(path="src/main.py", type="blob", mode="100644", size=20),
+    SimpleNamespace(path="src", type="tree", mode="040000", size=None),
+    SimpleNamespace(path="link.py", type="blob", mode="120000", size=7),
+    SimpleNamespace(path="vendor/lib", type="commit", mode="160000", size=None),
+]
+
+class FakeRepository:
+    """Stand-in for a PyGithub Repository that serves one Git tree."""
+
+    def __init__(self, truncated):
+        self.default_branch = "main"
+        self.tree_requests = []
+        self._tree = SimpleNamespace(raw_data={"truncated": truncated}, tree=TREE_ELEMENTS)
+
+    def get_git_tree(self, sha, recursive=False):
+        self.tree_requests.append((sha, recursive))
+        return self._tree
+
+def _client_for(repository):
+    client = GithubClient(github_token="test-token", use_cache=False)
+    client._get_repository = lambda owner, repo: repository
+    return client
+
+def test_list_repository_tree():
+    repository = FakeRepository(truncated=False)
+
+    files = _client_for(repository).list_repository_tree("owner", "repo")
+
+    assert repository.tree_requests == [("main", True)]
+    assert files == [{"name": "main.py", "path": "src/main.py", "type": "file", "size": 20}]
+
+def test_list_repository_tree_truncated():
+    # A truncated tree is incomplete, so the caller has to walk the directories instead
+    assert _client_for(FakeRepository(truncated=True)).list_repository_tree("owner", "repo") is None
+
+# Directory listings of a small repository: (path, type, size) per entry
+DIRECTORY_LISTINGS = {
+    "": [("README.md", "file", 10), ("logo.png", "file", 10), ("src", "dir", 0), ("node_modules", "dir", 0)],
+    "src": [("src/main.py", "file", 20), ("src/huge.py", "file", 600000), ("src/utils", "dir", 0)],
+    "src/utils": [("src/utils/helpers.py", "file", 30)],
+    "node_modules": [("node_modules/pkg.js", "file", 5)],
+}
+
+# Files left after dropping node_modules, the binary logo and the oversized file
+EXPECTED_FILES = {path: f"contents of {path}" for path in ["README.md", "src/main.py", "src/utils/helpers.py"]}
+
+class WalkableRepository:
+    """Stand-in for a PyGithub Repository whose Git tree is complete, truncated or unavailable."""
+
+    def __init__(self, tree_mode):
+        self.name = "repo"
+        self.default_branch = "main"
+        self.tree_mode = tree_mode
+        self.listed_dirs = []
+
+    def get_git_tree(self, sha, recursive=False):
+        if self.tree_mode == "error":
+            raise Exception("Git tree unavailable")
+        tree = [
+            SimpleNamespace(path=path, type="blob" if item_type == "file" else "tree",
+                            mode="100644" if item_type == "file" else "040000",
+                            size=size if item_type == "file" else None)
+            for items in DIRECTORY_LISTINGS.values()
+            for path, item_type, size in items
+        ]
+        return SimpleNamespace(raw_data={"truncated": self.tree_mode == "truncated"}, tree=tree)
+
+    def get_contents(self, path):
+        # Directories return a list of entries, files a single base64-encoded entry
+        if path in DIRECTORY_LISTINGS:
+            self.listed_dirs.append(path)
+            return [
+                SimpleNamespace(name=item_path.rsplit("/", 1)[-1], path=item_path, type=item_type, size=size)
+                for item_path, item_type, size in DIRECTORY_LISTINGS[path]
+            ]
+        return SimpleNamespace(encoding="base64", content=base64.b64encode(f"contents of {path}".encode()).decode())
+
+def test_get_repository_files_from_tree():
+    repository = WalkableRepository("complete")
+
+    assert _client_for(repository).get_repository_files("owner", "repo") == EXPECTED_FILES
+    assert repository.listed_dirs == []
+
+@pytest.mark.parametrize("tree_mode", ["truncated", "error"])
+def test_get_repository_files_walks_directories(tree_mode):
+    repository = WalkableRepository(tree_mode)
+
+    # Walking the directories finds the same files as the complete tree
+    assert _client_for(repository).get_repository_files("owner", "repo") == EXPECTED_FILES
+    assert sorted(repository.listed_dirs) == ["", "src", "src/utils"]
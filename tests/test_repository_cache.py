@@ -0,0 +1,99 @@
+import os
+import sys
+from types import SimpleNamespace
+
+# Add parent directory to path (once, even when the module is imported again)
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from RepositoryCache import RepoCache
+from RepositoryAnalyzer import RepositoryAnalyzer
+
+SAMPLE_FILES = {
+    "src/main.py": "print('Hello world')\n",
+    "docs/naïve.md": "Unicode survives the round trip: ✓\n",
+    "empty.txt": "",
+}
+
+def test_repo_files_round_trip(tmp_path):
+    assert RepoCache(str(tmp_path)).cache_repo_files("owner", "repo", SAMPLE_FILES)
+
+    # A new cache instance has nothing in memory, so this reads the file written above
+    assert RepoCache(str(tmp_path)).get_repo_files("owner", "repo") == SAMPLE_FILES
+
+def test_repo_files_missing(tmp_path):
+    assert RepoCache(str(tmp_path)).get_repo_files("owner", "repo") is None
+
+SECTION_MAP = {"src": ["src/main.py"], "docs": ["docs/naïve.md", "empty.txt"]}
+
+def test_sections_hit_with_same_files_and_settings(tmp_path):
+    cache = RepoCache(str(tmp_path))
+    files_hash = cache.get_files_hash(SAMPLE_FILES)
+    assert cache.cache_sections("owner", "repo", files_hash, "structural:15:True", SECTION_MAP)
+
+    same_hash = RepoCache(str(tmp_path)).get_files_hash(dict(SAMPLE_FILES))
+    assert RepoCache(str(tmp_path)).get_sections("owner", "repo", same_hash, "structural:15:True") == SECTION_MAP
+
+def test_sections_miss_when_file_content_changes(tmp_path):
+    cache = RepoCache(str(tmp_path))
+    cache.cache_sections("owner", "repo", cache.get_files_hash(SAMPLE_FILES), "structural:15:True", SECTION_MAP)
+
+    changed_files = dict(SAMPLE_FILES, **{"src/main.py": "print('Goodbye')\n"})
+    changed_hash = cache.get_files_hash(changed_files)
+
+    assert changed_hash != cache.get_files_hash(SAMPLE_FILES)
+    assert cache.get_sections("owner", "repo", changed_hash, "structural:15:True") is None
+
+def test_sections_keep_each_settings_key(tmp_path):
+    cache = RepoCache(str(tmp_path))
+    files_hash = cache.get_files_hash(SAMPLE_FILES)
+    other_map = {"everything": sorted(SAMPLE_FILES)}
+
+    cache.cache_sections("owner", "repo", files_hash, "structural:15:True", SECTION_MAP)
+    cache.cache_sections("owner", "repo", files_hash, "dependency:10:False", other_map)
+
+    assert cache.get_sections_path("owner", "repo") == str(tmp_path / "sections" / "owner_repo_sections.json")
+    assert cache.get_sections("owner", "repo", files_hash, "structural:15:True") == SECTION_MAP
+    assert cache.get_sections("owner", "repo", files_hash, "dependency:10:False") == other_map
+    assert cache.get_sections("owner", "repo", files_hash, "hybrid:15:True") is None
+
+def test_settings_key_includes_model_only_for_llm_clustering():
+    analyzer = RepositoryAnalyzer(github_client=None, claude_summarizer=None, use_cache=False)
+    args = SimpleNamespace(section_method="structural", max_section_size=15, auto_filter=True,
+                           claude_model="test-model")
+
+    assert analyzer._create_settings_key(args) == "structural:15:True"
+
+    args.section_method = "llm_cluster"
+    assert analyzer._create_settings_key(args) == "llm_cluster:15:True:test-model"
+
+def test_repo_files_memory_hit_returns_copy(tmp_path):
+    cache = RepoCache(str(tmp_path))
+    files = dict(SAMPLE_FILES)
+    cache.cache_repo_files("owner", "repo", files)
+
+    # Changes to the cached input or to a returned dict don't reach the cache
+    files["added.py"] = ""
+    returned = cache.get_repo_files("owner", "repo")
+    returned["src/main.py"] = "changed"
+
+    assert cache.get_repo_files("owner", "repo") == SAMPLE_FILES
+
+def test_repo_files_memory_evicts_least_recently_used(tmp_path):
+    cache = RepoCache(str(tmp_path), max_memory_entries=2)
+    for repo in ["first", "second"]:
+        cache.cache_repo_files("owner", repo, SAMPLE_FILES)
+
+    # Using "first" makes "second" the least recently used entry
+    cache.get_repo_files("owner", "first")
+    cache.cache_repo_files("owner", "third", SAMPLE_FILES)
+
+    assert list(cache._memory_cache) == [("owner", "first"), ("owner", "third")]
+
+    # With the files gone from disk, only repositories still in memory are found
+    for repo in ["first", "second", "third"]:
+        os.remove(cache.get_cache_path("owner", repo))
+    assert cache.get_repo_files("owner", "first") == SAMPLE_FILES
+    assert cache.get_repo_files("owner", "second") is None
+    assert cache.get_repo_files("owner", "third") == SAMPLE_FILES